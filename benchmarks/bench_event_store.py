@@ -0,0 +1,64 @@
+"""Compare memory held by a list of ``Event`` objects and an ``EventStore``.
+
+Usage::
+
+    python benchmarks/bench_event_store.py --events 100000 1000000
+
+Events are generated in memory with metadata shaped like normalised
+``events.jsonl`` records; sizes are measured with ``tracemalloc``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from oh2webui_cli.eventstore import EventStore
+from oh2webui_cli.grouper import Event
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def generate(count: int):
+    for index in range(count):
+        yield Event(
+            step=f"{2 + index // 8:03d}",
+            role=("user", "assistant", "tool")[index % 3],
+            content=f"event {index}",
+            timestamp=_START + timedelta(milliseconds=index),
+            status="success" if index % 5 else None,
+            metadata={"source": "events.jsonl", "source_index": index + 1, "cwd": "/workspace"},
+        )
+
+
+def measure(build: Callable[[], object]) -> tuple[float, object]:
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / 2**20, value
+
+
+def run(sizes: list[int]) -> None:
+    print(f"{'events':>9} {'list MiB':>10} {'store MiB':>10} {'ratio':>6}")
+    for size in sizes:
+        listed, events = measure(lambda size=size: list(generate(size)))
+        del events
+        stored, store = measure(lambda size=size: EventStore.from_events(generate(size)))
+        del store
+        print(f"{size:>9} {listed:>10.1f} {stored:>10.1f} {listed / stored:>6.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+    run(args.events)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Measure repeated access to derived ``EventGroup`` properties.
+
+Usage::
+
+    python benchmarks/bench_group_properties.py --events 1000 5000 20000 --accesses 100
+
+Each group is built fresh, then ``status``, ``tags``, ``cwd`` and ``title``
+are read ``--accesses`` times, as front-matter rendering and filters do.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from oh2webui_cli.grouper import Event, EventGroup
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def build_group(count: int) -> EventGroup:
+    events = [
+        Event(
+            step="002",
+            role="assistant" if index % 2 else "tool",
+            content="" if index < count // 2 else f"line {index}\nmore",
+            timestamp=_START + timedelta(seconds=index),
+            status=None,
+            metadata={"tags": [f"t{index % 13}", "bench"], "source_index": index},
+        )
+        for index in range(count)
+    ]
+    return EventGroup(step="002", events=events)
+
+
+def run(sizes: list[int], accesses: int) -> None:
+    print(f"{'events':>8} {'first access µs':>16} {'repeat access µs':>17}")
+    for size in sizes:
+        group = build_group(size)
+        started = time.perf_counter()
+        _ = group.status, group.tags, group.cwd, group.title
+        first = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(accesses):
+            _ = group.status, group.tags, group.cwd, group.title
+        repeat = (time.perf_counter() - started) / accesses
+        print(f"{size:>8} {first * 1e6:>16.1f} {repeat * 1e6:>17.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, nargs="+", default=[1_000, 5_000, 20_000])
+    parser.add_argument("--accesses", type=int, default=100)
+    args = parser.parse_args()
+    run(args.events, args.accesses)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Compare JSON backends on synthetic ``events.jsonl`` files.
+
+Usage::
+
+    python benchmarks/bench_json_backends.py --sizes 10000 100000 1000000
+
+For every size a session is generated once in a temporary directory and each
+installed backend parses it with the grouper's loader (``iter_events``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from oh2webui_cli import jsonbackend
+from oh2webui_cli.grouper import iter_events
+
+_ROLES = ("user", "assistant", "tool")
+
+
+def write_events(path: Path, count: int, *, seed: int = 0) -> int:
+    rng = random.Random(seed)
+    with path.open("w", encoding="utf-8") as handle:
+        for index in range(count):
+            record = {
+                "id": index,
+                "step": f"{2 + index // 8:03d}",
+                "role": _ROLES[index % len(_ROLES)],
+                "timestamp": f"2024-01-01T{(index // 3600) % 24:02d}:"
+                f"{(index // 60) % 60:02d}:{index % 60:02d}Z",
+                "status": "success" if rng.random() > 0.05 else "error",
+                "content": " ".join(
+                    rng.choice(("run", "pytest", "edit", "file", "ok", "diff")) for _ in range(24)
+                ),
+                "metadata": {"cwd": "/workspace", "tags": ["bench", f"t{index % 7}"]},
+            }
+            handle.write(json.dumps(record) + "\n")
+    return path.stat().st_size
+
+
+def run(sizes: list[int], repeat: int) -> None:
+    backends = jsonbackend.available_backends()
+    print(f"backends: {', '.join(backends)}")
+    print(f"{'events':>10} {'MiB':>8} {'backend':>8} {'best s':>9} {'events/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            raw = Path(tmp) / f"raw-{size}"
+            raw.mkdir()
+            nbytes = write_events(raw / "events.jsonl", size)
+            for name in backends:
+                jsonbackend.set_backend(name)
+                best = float("inf")
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    parsed = sum(1 for _ in iter_events(raw))
+                    best = min(best, time.perf_counter() - started)
+                assert parsed == size
+                megabytes = nbytes / 2**20
+                print(f"{size:>10} {megabytes:>8.1f} {name:>8} {best:>9.3f} {size / best:>12,.0f}")
+    jsonbackend.set_backend(None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend; best is reported")
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark ``distiller._summarise_content`` on large tool outputs.
+
+Usage::
+
+    python benchmarks/bench_summarise.py --megabytes 1 8 32
+
+Compares the shipped summariser with the original multi-pass version on
+command logs made of a short preamble followed by megabytes of output, both
+fenced (skipped) and unfenced (prose that gets truncated).
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from typing import Callable
+
+from oh2webui_cli.distiller import _summarise_content
+
+
+def reference_summarise(raw: str) -> str:
+    tokens: list[str] = []
+    in_code_block = False
+    for original_line in raw.splitlines():
+        line = original_line.strip()
+        if line.startswith("```"):
+            in_code_block = not in_code_block
+            continue
+        if in_code_block or not line:
+            continue
+        line = re.sub(r"^[#>*-]+\s*", "", line)
+        line = re.sub(r"^\d+[.)]\s*", "", line)
+        line = re.sub(r"```[A-Za-z0-9_-]*", "", line)
+        line = re.sub(r"\s+", " ", line)
+        tokens.append(line)
+    summary = re.sub(r"\s+", " ", " ".join(tokens).strip())
+    if len(summary) > 200:
+        summary = summary[:197].rstrip() + "..."
+    return summary
+
+
+def command_log(megabytes: int, fenced: bool) -> str:
+    line = "2024-01-01T00:00:00Z INFO  collecting tests/test_module.py::test_case PASSED\n"
+    body = line * (megabytes * 2**20 // len(line))
+    if fenced:
+        return "$ pytest -q\n```\n" + body + "```\n"
+    return "$ pytest -q\n" + body
+
+
+def best_of(function: Callable[[str], str], raw: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(raw)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(sizes: list[int], repeat: int) -> None:
+    print(f"{'MiB':>5} {'layout':>8} {'reference ms':>13} {'single-pass ms':>15} {'speedup':>8}")
+    for size in sizes:
+        for fenced in (False, True):
+            raw = command_log(size, fenced)
+            assert _summarise_content(raw) == reference_summarise(raw)
+            old = best_of(reference_summarise, raw, repeat)
+            new = best_of(_summarise_content, raw, repeat)
+            layout = "fenced" if fenced else "plain"
+            print(f"{size:>5} {layout:>8} {old * 1e3:>13.1f} {new * 1e3:>15.3f} {old / new:>8.0f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.megabytes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from .config import Settings
+from .distiller import distill_session
+
+
+class BatchError(RuntimeError):
+    """Raised when a batch run cannot be scheduled."""
+
+
+@dataclass(slots=True)
+class SessionOutcome:
+    session_id: str
+    artifacts_dir: Path
+    artifacts: list[str]
+    deduplicated: int
+    duration: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(slots=True)
+class BatchResult:
+    outcomes: list[SessionOutcome]
+    workers: int
+    elapsed: float
+
+    @property
+    def succeeded(self) -> list[SessionOutcome]:
+        return [outcome for outcome in self.outcomes if outcome.ok]
+
+    @property
+    def failed(self) -> list[SessionOutcome]:
+        return [outcome for outcome in self.outcomes if not outcome.ok]
+
+
+def discover_sessions(sessions_root: Path) -> list[str]:
+    """Return the session identifiers (sub-directory names) found under a sessions root."""
+
+    sessions_root = Path(sessions_root).expanduser()
+    if not sessions_root.is_dir():
+        raise BatchError(f"sessions root {sessions_root} is not a directory")
+    return sorted(
+        child.name
+        for child in sessions_root.iterdir()
+        if child.is_dir() and not child.name.startswith(".")
+    )
+
+
+def _distill_one(job: tuple[str, Path, Path, Settings, dict]) -> SessionOutcome:
+    session_id, raw_root, artifacts_root, settings, options = job
+    started = time.perf_counter()
+    try:
+        result = distill_session(
+            session_id=session_id,
+            raw_root=raw_root,
+            artifacts_root=artifacts_root,
+            settings=settings,
+            **options,
+        )
+    except Exception as exc:  # reported per session rather than aborting the batch
+        return SessionOutcome(
+            session_id=session_id,
+            artifacts_dir=artifacts_root,
+            artifacts=[],
+            deduplicated=0,
+            duration=time.perf_counter() - started,
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    return SessionOutcome(
+        session_id=session_id,
+        artifacts_dir=result.artifacts_dir,
+        artifacts=[record.filename for record in result.artifacts],
+        deduplicated=result.deduplicated,
+        duration=time.perf_counter() - started,
+    )
+
+
+def distill_sessions(
+    session_ids: Iterable[str],
+    sessions_root: Path,
+    artifacts_root: Path,
+    settings: Settings,
+    *,
+    workers: int | None = None,
+    streaming: bool = False,
+    incremental: bool = False,
+    per_step: bool = False,
+) -> BatchResult:
+    """Distill many sessions across a process pool.
+
+    Each session is read from ``sessions_root / <id>`` and written to
+    ``artifacts_root / <id>``. Failures are captured per session instead of
+    aborting the batch; outcomes are returned in the order they were requested.
+    """
+
+    sessions_root = Path(sessions_root).expanduser()
+    artifacts_root = Path(artifacts_root).expanduser()
+    options = {"streaming": streaming, "incremental": incremental, "per_step": per_step}
+    jobs = [
+        (session_id, sessions_root / session_id, artifacts_root / session_id, settings, options)
+        for session_id in dict.fromkeys(session_ids)
+    ]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise BatchError("workers must be at least 1")
+    workers = max(1, min(workers, len(jobs)))
+
+    started = time.perf_counter()
+    if workers == 1:
+        outcomes = [_distill_one(job) for job in jobs]
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(_distill_one, jobs, chunksize=chunksize))
+
+    return BatchResult(outcomes=outcomes, workers=workers, elapsed=time.perf_counter() - started)
+
+
+__all__ = [
+    "BatchError",
+    "BatchResult",
+    "SessionOutcome",
+    "discover_sessions",
+    "distill_sessions",
+]
@@ -4,11 +4,13 @@ import argparse
 import json
 from pathlib import Path
 
+from .batch import discover_sessions, distill_sessions
 from .chatter import create_chat
 from .config import load_settings
 from .distiller import distill_session
-from .extractor import extract_session
+from .extractor import EXTRACTION_MODES, extract_session
 from .packager import package_artifacts
+from .pipeline import run_pipeline
 from .uploader import UploadError, upload_artifacts
 
 
@@ -33,11 +35,88 @@ def build_parser() -> argparse.ArgumentParser:
     extract_parser.add_argument(
         "--overwrite", action="store_true", help="Overwrite existing destination"
     )
+    extract_parser.add_argument(
+        "--mode",
+        choices=EXTRACTION_MODES,
+        default="copy",
+        help="How files are materialised: copy, or link via reflink/hardlink/symlink (auto)",
+    )
+    extract_parser.add_argument(
+        "--selective",
+        action="store_true",
+        help="Only extract the event files the distiller reads",
+    )
+    extract_parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        help="Extra glob (relative to the session) to extract in selective mode; repeatable",
+    )
+    extract_parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Update an existing destination with new, changed and appended files",
+    )
+    extract_parser.add_argument(
+        "--checksum",
+        action="store_true",
+        help="With --sync, compare content hashes instead of size and mtime",
+    )
 
     distill_parser = subcommands.add_parser("distill", help="Distill raw events into artifacts")
     distill_parser.add_argument("--session", required=True, help="Session identifier")
     distill_parser.add_argument("--raw", required=True, help="Path to extracted raw events")
     distill_parser.add_argument("--dst", required=True, help="Artifacts output directory")
+    distill_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Read and group events incrementally to bound memory on large sessions; steps "
+            "follow source order and a step that reappears later becomes a separate block"
+        ),
+    )
+    distill_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only parse events added since the last run (checkpoint in run.checkpoint.json)",
+    )
+    distill_parser.add_argument(
+        "--per-step",
+        action="store_true",
+        help="Write one deduplicated artifact per step instead of session-transcript.md",
+    )
+
+    batch_parser = subcommands.add_parser("distill-batch", help="Distill many sessions in parallel")
+    batch_parser.add_argument("--src", help="Sessions root directory (defaults to SESSIONS_DIR)")
+    batch_parser.add_argument(
+        "--session",
+        action="append",
+        help="Session identifier to distill (repeatable; defaults to every session under --src)",
+    )
+    batch_parser.add_argument(
+        "--dst", required=True, help="Artifacts root; each session is written to <dst>/<id>"
+    )
+    batch_parser.add_argument(
+        "--workers", type=int, help="Number of worker processes (defaults to CPU count)"
+    )
+    batch_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Read and group events incrementally to bound memory on large sessions; steps "
+            "follow source order and a step that reappears later becomes a separate block"
+        ),
+    )
+    batch_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only parse events added since the last run (checkpoint in run.checkpoint.json)",
+    )
+    batch_parser.add_argument(
+        "--per-step",
+        action="store_true",
+        help="Write one deduplicated artifact per step instead of session-transcript.md",
+    )
 
     package_parser = subcommands.add_parser("package", help="Create a tarball of artifacts")
     package_parser.add_argument("--artifacts", required=True, help="Artifacts directory")
@@ -52,6 +131,11 @@ def build_parser() -> argparse.ArgumentParser:
         default="3A",
         help="Chat variant to prepare for (affects metadata only)",
     )
+    upload_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Concurrent uploads (defaults to OH2WEBUI_UPLOAD_WORKERS or 1)",
+    )
 
     chat_parser = subcommands.add_parser(
         "chat", help="Create a chat referencing uploaded artifacts"
@@ -71,6 +155,66 @@ def build_parser() -> argparse.ArgumentParser:
     )
     chat_parser.add_argument("--status", default="ready", help="Session status for chat title")
 
+    run_parser = subcommands.add_parser(
+        "run", help="Run every stage for many sessions with overlapping stages"
+    )
+    run_parser.add_argument("--src", help="Sessions root directory (defaults to SESSIONS_DIR)")
+    run_parser.add_argument(
+        "--session",
+        action="append",
+        help="Session identifier to process (repeatable; defaults to every session under --src)",
+    )
+    run_parser.add_argument(
+        "--work", required=True, help="Working root; sessions use <work>/<id>/raw and /artifacts"
+    )
+    run_parser.add_argument(
+        "--variant",
+        choices=["3A", "3B"],
+        default="3A",
+        help="Chat variant (3A completion, 3B prefill-only)",
+    )
+    run_parser.add_argument("--status", default="complete", help="Session status for chat titles")
+    run_parser.add_argument(
+        "--cpu-workers",
+        type=int,
+        help="Processes for extract/distill/package (defaults to CPU count)",
+    )
+    run_parser.add_argument(
+        "--net-workers", type=int, default=4, help="Threads for upload/chat stages"
+    )
+    run_parser.add_argument(
+        "--overwrite", action="store_true", help="Re-extract existing raw directories"
+    )
+    run_parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Bring existing raw directories up to date (see extract --sync)",
+    )
+    run_parser.add_argument(
+        "--extract-mode",
+        choices=EXTRACTION_MODES,
+        default="copy",
+        help="How raw session files are materialised (see extract --mode)",
+    )
+    run_parser.add_argument(
+        "--selective",
+        action="store_true",
+        help="Only extract the event files the distiller reads",
+    )
+    run_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only parse events added since the last run (checkpoint in run.checkpoint.json)",
+    )
+    run_parser.add_argument(
+        "--per-step",
+        action="store_true",
+        help="Write one deduplicated artifact per step instead of session-transcript.md",
+    )
+    run_parser.add_argument(
+        "--package", action="store_true", help="Also write artifacts.tar.gz for each session"
+    )
+
     return parser
 
 
@@ -90,6 +234,11 @@ def main(argv: list[str] | None = None) -> None:
             source_root=source_root,
             destination=Path(args.dst),
             overwrite=args.overwrite,
+            mode=args.mode,
+            selective=args.selective,
+            include=args.include,
+            sync=args.sync,
+            checksum=args.checksum,
         )
         _print_json(
             {
@@ -97,6 +246,14 @@ def main(argv: list[str] | None = None) -> None:
                 "source": str(result.source),
                 "destination": str(result.destination),
                 "copied": result.copied,
+                "mode": result.mode,
+                "files_linked": result.files_linked,
+                "files_copied": result.files_copied,
+                "files_skipped": result.files_skipped,
+                "bytes_skipped": result.bytes_skipped,
+                "files_transferred": result.files_transferred,
+                "bytes_transferred": result.bytes_transferred,
+                "files_appended": result.files_appended,
             }
         )
         return
@@ -107,6 +264,9 @@ def main(argv: list[str] | None = None) -> None:
             raw_root=Path(args.raw),
             artifacts_root=Path(args.dst),
             settings=settings,
+            streaming=args.stream,
+            incremental=args.incremental,
+            per_step=args.per_step,
         )
         _print_json(
             {
@@ -119,6 +279,41 @@ def main(argv: list[str] | None = None) -> None:
         )
         return
 
+    if args.command == "distill-batch":
+        sessions_root = Path(args.src) if args.src else settings.sessions_dir
+        session_ids = args.session or discover_sessions(sessions_root)
+        batch = distill_sessions(
+            session_ids,
+            sessions_root,
+            Path(args.dst),
+            settings,
+            workers=args.workers,
+            streaming=args.stream,
+            incremental=args.incremental,
+            per_step=args.per_step,
+        )
+        _print_json(
+            {
+                "workers": batch.workers,
+                "elapsed": round(batch.elapsed, 3),
+                "succeeded": len(batch.succeeded),
+                "failed": len(batch.failed),
+                "sessions": [
+                    {
+                        "session": outcome.session_id,
+                        "ok": outcome.ok,
+                        "artifacts": outcome.artifacts,
+                        "artifact_dir": str(outcome.artifacts_dir),
+                        "deduplicated": outcome.deduplicated,
+                        "duration": round(outcome.duration, 3),
+                        "error": outcome.error,
+                    }
+                    for outcome in batch.outcomes
+                ],
+            }
+        )
+        return
+
     if args.command == "package":
         outcome = package_artifacts(
             Path(args.artifacts), Path(args.output) if args.output else None
@@ -137,6 +332,7 @@ def main(argv: list[str] | None = None) -> None:
             artifacts_dir=Path(args.artifacts),
             settings=settings,
             variant=args.variant,
+            workers=args.workers,
         )
         _print_json(
             {
@@ -144,10 +340,16 @@ def main(argv: list[str] | None = None) -> None:
                 "collection_id": result.collection_id,
                 "collection_name": result.collection_name,
                 "file_ids": result.file_ids,
+                "failed_attachments": result.failed_attachments,
                 "variant": result.variant,
                 "dry_run": result.dry_run,
             }
         )
+        if result.failed_attachments:
+            raise SystemExit(
+                f"{len(result.failed_attachments)} artifact(s) failed to attach to collection "
+                f"{result.collection_id}"
+            )
         return
 
     if args.command == "chat":
@@ -171,4 +373,47 @@ def main(argv: list[str] | None = None) -> None:
         _print_json(payload)
         return
 
+    if args.command == "run":
+        sessions_root = Path(args.src) if args.src else settings.sessions_dir
+        session_ids = args.session or discover_sessions(sessions_root)
+        outcomes = run_pipeline(
+            session_ids,
+            sessions_root=sessions_root,
+            work_root=Path(args.work),
+            settings=settings,
+            variant=args.variant,
+            status=args.status,
+            cpu_workers=args.cpu_workers,
+            net_workers=args.net_workers,
+            overwrite=args.overwrite,
+            sync=args.sync,
+            extract_mode=args.extract_mode,
+            selective=args.selective,
+            incremental=args.incremental,
+            per_step=args.per_step,
+            package=args.package,
+        )
+        _print_json(
+            {
+                "succeeded": sum(1 for outcome in outcomes if outcome.ok),
+                "failed": sum(1 for outcome in outcomes if not outcome.ok),
+                "sessions": [
+                    {
+                        "session": outcome.session_id,
+                        "ok": outcome.ok,
+                        "stage": outcome.stage,
+                        "artifact_dir": str(outcome.artifacts_dir),
+                        "collection_id": outcome.collection_id,
+                        "chat_id": outcome.chat_id,
+                        "durations": {
+                            stage: round(seconds, 3) for stage, seconds in outcome.durations.items()
+                        },
+                        "error": outcome.error,
+                    }
+                    for outcome in outcomes
+                ],
+            }
+        )
+        return
+
     raise UploadError(f"unknown command {args.command}")
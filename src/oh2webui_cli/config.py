@@ -7,6 +7,7 @@ from typing import Optional
 
 from dotenv import load_dotenv
 
+from .endpoints import default_cache_path
 
 _VERSION_FILE = Path(__file__).resolve().parent.parent.parent / "VERSION"
 
@@ -28,6 +29,15 @@ class Settings:
     model: str
     debug_mode: bool
     capture_chat_export: bool
+    upload_workers: int = 1
+    poll_timeout: float = 300.0
+    endpoint_cache: Optional[Path] = None
+    endpoint_cache_ttl: float = 86400.0
+    stream_completions: bool = True
+    parse_workers: int = 1
+    event_cache: bool = False
+    compact_events: bool = False
+    lazy_content: bool = False
     package_name: str = "codex-cli-oh2webui"
     version: str = _read_version()
 
@@ -71,6 +81,47 @@ def load_settings() -> Settings:
     else:
         capture_chat_export = capture_flag in {"1", "true", "yes", "on"}
 
+    try:
+        upload_workers = max(1, int(os.getenv("OH2WEBUI_UPLOAD_WORKERS") or "1"))
+    except ValueError:
+        upload_workers = 1
+
+    try:
+        poll_timeout = max(1.0, float(os.getenv("OH2WEBUI_POLL_TIMEOUT") or "300"))
+    except ValueError:
+        poll_timeout = 300.0
+
+    cache_env = os.getenv("OH2WEBUI_ENDPOINT_CACHE")
+    endpoint_cache: Optional[Path]
+    if cache_env is None:
+        endpoint_cache = default_cache_path()
+    elif cache_env.lower() in {"", "0", "false", "no", "off", "none"}:
+        endpoint_cache = None
+    else:
+        endpoint_cache = Path(cache_env).expanduser()
+
+    try:
+        endpoint_cache_ttl = float(os.getenv("OH2WEBUI_ENDPOINT_CACHE_TTL") or "86400")
+    except ValueError:
+        endpoint_cache_ttl = 86400.0
+
+    stream_env = os.getenv("OH2WEBUI_STREAM_COMPLETIONS") or "true"
+    stream_completions = stream_env.lower() in {"1", "true", "yes", "on"}
+
+    try:
+        parse_workers = max(1, int(os.getenv("OH2WEBUI_PARSE_WORKERS") or "1"))
+    except ValueError:
+        parse_workers = 1
+
+    event_cache_env = os.getenv("OH2WEBUI_EVENT_CACHE") or "false"
+    event_cache = event_cache_env.lower() in {"1", "true", "yes", "on"}
+
+    compact_env = os.getenv("OH2WEBUI_COMPACT_EVENTS") or "false"
+    compact_events = compact_env.lower() in {"1", "true", "yes", "on"}
+
+    lazy_env = os.getenv("OH2WEBUI_LAZY_CONTENT") or "false"
+    lazy_content = lazy_env.lower() in {"1", "true", "yes", "on"}
+
     placeholder_tokens = {"", "your-token-here", "changeme"}
     if not api_token or api_token in placeholder_tokens:
         api_token = None
@@ -96,6 +147,15 @@ def load_settings() -> Settings:
         model=model,
         debug_mode=debug_mode,
         capture_chat_export=capture_chat_export,
+        upload_workers=upload_workers,
+        poll_timeout=poll_timeout,
+        endpoint_cache=endpoint_cache,
+        endpoint_cache_ttl=endpoint_cache_ttl,
+        stream_completions=stream_completions,
+        parse_workers=parse_workers,
+        event_cache=event_cache,
+        compact_events=compact_events,
+        lazy_content=lazy_content,
     )
 
 
@@ -1,15 +1,34 @@
 from __future__ import annotations
 
 import hashlib
+import io
 import json
+import os
 import re
-from dataclasses import asdict, dataclass
+import shutil
+import tempfile
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, Callable, Iterable, Iterator
 
 from .config import Settings
-from .grouper import Event, EventGroup, load_event_groups
+from .eventcache import load_events, load_store
+from .eventstore import EventStore
+from .grouper import (
+    Event,
+    EventGroup,
+    GroupingError,
+    SourceCheckpoint,
+    StaleCheckpointError,
+    find_event_sources,
+    group_events,
+    iter_appended_events,
+    iter_event_groups,
+    iter_events,
+    load_event_groups,
+)
 
 
 class DistillationError(RuntimeError):
@@ -57,89 +76,467 @@ def _render_front_matter(
         front_matter["branch"] = branch
     return "---\n" + json.dumps(front_matter, indent=2) + "\n---\n\n"
 
+
+_SUMMARY_LIMIT = 200
+# The line boundaries recognised by ``str.splitlines``.
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_CONTENT = re.compile(f"[^{_LINE_BREAKS}]+")
+# Markdown heading/quote/bullet markers, then an ordered-list number.
+_LINE_PREFIX = re.compile(r"(?:[#>*-]+\s*)?(?:\d+[.)]\s*)?")
+_FENCE_MARKER = re.compile(r"```[A-Za-z0-9_-]*")
+
+
+def _find_closing_fence(raw: str, position: int) -> int:
+    """Return where the next line starting with a fence begins, or ``len(raw)``."""
+
+    while True:
+        fence = raw.find("```", position)
+        if fence == -1:
+            return len(raw)
+        start = fence
+        while start and raw[start - 1] not in _LINE_BREAKS and raw[start - 1].isspace():
+            start -= 1
+        if not start or raw[start - 1] in _LINE_BREAKS:
+            return start
+        position = fence + 3
+
+
 def _summarise_content(raw: str) -> str:
-    tokens: list[str] = []
+    """Collapse prose outside code fences into one line of at most 200 characters.
+
+    Lines are scanned lazily and scanning stops as soon as the summary is
+    known to be truncated, so huge tool outputs cost only their first lines.
+    """
+
+    words: list[str] = []
+    length = -1  # length of " ".join(words)
     in_code_block = False
 
-    for original_line in raw.splitlines():
-        line = original_line.strip()
+    position = 0
+    while match := _LINE_CONTENT.search(raw, position):
+        position = match.end()
+        line = match.group().strip()
 
         if line.startswith("```"):
             in_code_block = not in_code_block
+            if in_code_block:
+                # Jump straight to the closing fence instead of visiting every line.
+                position = _find_closing_fence(raw, position)
             continue
 
         if in_code_block or not line:
             continue
 
-        line = re.sub(r"^[#>*-]+\s*", "", line)
-        line = re.sub(r"^\d+[.)]\s*", "", line)
-        line = re.sub(r"```[A-Za-z0-9_-]*", "", line)
-        line = re.sub(r"\s+", " ", line)
-        tokens.append(line)
+        line = line[_LINE_PREFIX.match(line).end() :]
+        if "```" in line:
+            line = _FENCE_MARKER.sub("", line)
+        for word in line.split():
+            words.append(word)
+            length += len(word) + 1
+        if length > _SUMMARY_LIMIT:
+            break
+
+    summary = " ".join(words)
+    if len(summary) > _SUMMARY_LIMIT:
+        summary = summary[: _SUMMARY_LIMIT - 3].rstrip() + "..."
+    return summary
+
+
+@dataclass(slots=True)
+class _StepSummary:
+    step: str
+    summary: str | None
+    summary_at: datetime | None
+    events: int
+    first_event: datetime
+    last_event: datetime
+    # ``(source name, index)`` of the step's first event and of its summary event,
+    # used to break timestamp ties the way a full rebuild does.
+    position: tuple[str, int] = ("", 0)
+    summary_position: tuple[str, int] | None = None
+
+
+_SourcePosition = tuple[str, int]
+
+
+def _event_position(event: Event) -> _SourcePosition:
+    index = event.metadata.get("source_index")
+    return str(event.metadata.get("source", "")), index if isinstance(index, int) else 0
+
+
+def _source_order(raw_root: Path) -> Callable[[_SourcePosition], tuple[int, int]]:
+    """Return a sort key ranking positions in the order a full rebuild loads them."""
+
+    ranks: dict[str, int] = {}
+    for path in find_event_sources(raw_root):
+        ranks.setdefault(path.name, len(ranks))
+    return lambda position: (ranks.get(position[0], len(ranks)), position[1])
+
+
+def _numeric_step(step: str) -> int | None:
+    try:
+        return int(step)
+    except (TypeError, ValueError):
+        return None
+
 
-    summary = " ".join(tokens).strip()
-    summary = re.sub(r"\s+", " ", summary)
-    if len(summary) > 200:
-        summary = summary[:197].rstrip() + "..."
+def _is_bootstrap_step(step: str) -> bool:
+    # Skip system bootstrap prompts (Step 0) and initial instructions (Step 1/001)
+    return _numeric_step(step) in {0, 1}
+
+
+def _step_label(step: str) -> str:
+    numeric_step = _numeric_step(step)
+    return f"Step {numeric_step}" if numeric_step is not None else f"Step {step}"
+
+
+def _add_event(
+    summary: _StepSummary | None,
+    event: Event,
+    order: Callable[[_SourcePosition], tuple[int, int]],
+) -> _StepSummary:
+    ts = event.timestamp.astimezone(timezone.utc)
+    position = _event_position(event)
+    if summary is None:
+        summary = _StepSummary(
+            step=event.step,
+            summary=None,
+            summary_at=None,
+            events=0,
+            first_event=ts,
+            last_event=ts,
+            position=position,
+        )
+    summary.events += 1
+    if ts < summary.first_event:
+        summary.first_event = ts
+    if ts > summary.last_event:
+        summary.last_event = ts
+    if order(position) < order(summary.position):
+        summary.position = position
+
+    # The earliest event with meaningful content provides the step summary; on equal
+    # timestamps the event loaded first wins, as it does in a full rebuild.
+    if (
+        summary.summary_at is None
+        or ts < summary.summary_at
+        or (
+            ts == summary.summary_at
+            and summary.summary_position is not None
+            and order(position) < order(summary.summary_position)
+        )
+    ):
+        candidate = _summarise_content(event.content)
+        if candidate:
+            summary.summary = candidate
+            summary.summary_at = ts
+            summary.summary_position = position
+    return summary
+
+
+def _summarise_group(group: EventGroup) -> _StepSummary:
+    """Summarise a step from its precomputed bounds and its earliest meaningful event.
+
+    Group events are ordered by timestamp, so the scan stops at the first
+    event with content instead of visiting the rest of the step.
+    """
+
+    assert group.started_at is not None and group.completed_at is not None
+    summary = _StepSummary(
+        step=group.step,
+        summary=None,
+        summary_at=None,
+        events=len(group.events),
+        first_event=group.started_at.astimezone(timezone.utc),
+        last_event=group.completed_at.astimezone(timezone.utc),
+    )
+    for event in group.events:
+        candidate = _summarise_content(event.content)
+        if candidate:
+            summary.summary = candidate
+            summary.summary_at = event.timestamp.astimezone(timezone.utc)
+            break
     return summary
 
 
-def _format_content(groups: Iterable[EventGroup]) -> tuple[str, int, datetime, datetime]:
-    lines: list[str] = []
+def _write_steps(
+    handle: BinaryIO, steps: Iterable[_StepSummary]
+) -> tuple[str, int, datetime, datetime]:
+    """Write the transcript body to ``handle`` one step block at a time.
+
+    Returns ``(digest, total_events, first_event, last_event)`` where
+    ``digest`` is the SHA-256 of the bytes written.
+    """
+
+    digest = hashlib.sha256()
     total_events = 0
     first_timestamp: datetime | None = None
     last_timestamp: datetime | None = None
+    separator = ""
+
+    for step in steps:
+        block = f"{separator}{_step_label(step.step)}\n{step.summary or '(no content)'}\n"
+        data = block.encode("utf-8")
+        handle.write(data)
+        digest.update(data)
+        separator = "\n"
+
+        total_events += step.events
+        if first_timestamp is None or step.first_event < first_timestamp:
+            first_timestamp = step.first_event
+        if last_timestamp is None or step.last_event > last_timestamp:
+            last_timestamp = step.last_event
+
+    if first_timestamp is None or last_timestamp is None:
+        data = b"(no events captured)\n"
+        handle.write(data)
+        digest.update(data)
+        now = datetime.now(timezone.utc)
+        return digest.hexdigest(), 0, now, now
+    return digest.hexdigest(), total_events, first_timestamp, last_timestamp
 
-    for group in groups:
-        try:
-            numeric_step = int(group.step)
-        except (TypeError, ValueError):
-            numeric_step = None
 
-        # Skip system bootstrap prompts (Step 0) and initial instructions (Step 1/001)
-        if numeric_step in {0, 1}:
+def _summarise_groups(groups: Iterable[EventGroup]) -> Iterator[_StepSummary]:
+    return (_summarise_group(group) for group in groups if not _is_bootstrap_step(group.step))
+
+
+_COPY_CHUNK = 1 << 20
+
+
+def _write_artifact(path: Path, front_matter: str, body: BinaryIO) -> None:
+    """Atomically replace ``path`` with ``front_matter`` followed by the contents of ``body``."""
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("wb") as handle:
+            handle.write(front_matter.encode("utf-8"))
+            body.seek(0)
+            shutil.copyfileobj(body, handle, _COPY_CHUNK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _name_part(value: str) -> str:
+    return _UNSAFE_NAME.sub("-", value).strip("-.") or "unknown"
+
+
+def _content_hash(group: EventGroup, contents: list[str]) -> str:
+    """Hash a step's roles and whitespace-normalised ``contents`` (one per event).
+
+    Step ids and timestamps are left out so that a step repeating earlier
+    output hashes the same and can be deduplicated.
+    """
+
+    digest = hashlib.sha256()
+    for event, content in zip(group.events, contents):
+        content = _WHITESPACE.sub(" ", content).strip()
+        digest.update(f"{event.role}\0{content}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _render_step_front_matter(
+    *, settings: Settings, session_id: str, group: EventGroup, digest: str
+) -> str:
+    assert group.started_at is not None and group.completed_at is not None
+    front_matter: dict = {
+        "project": settings.project,
+        "session": session_id,
+        "step": group.step,
+        "first_event": group.started_at.astimezone(timezone.utc).isoformat(),
+        "last_event": group.completed_at.astimezone(timezone.utc).isoformat(),
+        "status": group.status,
+        "events": len(group.events),
+        "hash": digest,
+    }
+    exit_code = next(
+        (
+            event.metadata["exit_code"]
+            for event in reversed(group.events)
+            if event.metadata.get("exit_code") is not None
+        ),
+        None,
+    )
+    if exit_code is not None:
+        front_matter["exit"] = exit_code
+    if group.tags:
+        front_matter["tags"] = group.tags
+    if group.cwd:
+        front_matter["cwd"] = group.cwd
+    if settings.branch:
+        front_matter["branch"] = settings.branch
+    return "---\n" + json.dumps(front_matter, indent=2, default=str) + "\n---\n\n"
+
+
+def _render_step_body(group: EventGroup, contents: list[str]) -> str:
+    lines = [f"# {_step_label(group.step)}: {group.title}", ""]
+    for event, content in zip(group.events, contents):
+        timestamp = event.timestamp.astimezone(timezone.utc).isoformat()
+        lines.append(f"## {event.role} · {timestamp}")
+        lines.append("")
+        lines.append(content.strip() or "(no content)")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _write_step_artifacts(
+    groups: Iterable[EventGroup],
+    artifacts_root: Path,
+    *,
+    settings: Settings,
+    session_id: str,
+    ingest_log: Path,
+) -> tuple[list[ArtifactRecord], int]:
+    """Write one ``artifact-{step}-{hash8}-{status}.md`` per step.
+
+    Steps whose normalised content hash was already written are skipped and
+    counted; ``artifact-*.md`` files left over from earlier runs are removed.
+    Raises :class:`DistillationError` before touching ``artifacts_root`` when
+    there is no non-bootstrap step.
+    """
+
+    steps = (group for group in groups if not _is_bootstrap_step(group.step))
+    first = next(steps, None)
+    if first is None:
+        raise DistillationError("no steps available for per-step artifacts")
+
+    records: list[ArtifactRecord] = []
+    written: set[str] = set()
+    deduplicated = 0
+    for group in chain([first], steps):
+        # Lazy events re-read their source on every ``content`` access, so each
+        # step's content is loaded once and shared by the hash and the body.
+        contents = [event.content for event in group.events]
+        digest = _content_hash(group, contents)
+        if digest in written:
+            deduplicated += 1
+            _append_ingest_log(ingest_log, f"skip duplicate step={group.step} hash={digest[:8]}")
             continue
+        written.add(digest)
 
-        step_label = (
-            f"Step {numeric_step}"
-            if numeric_step is not None
-            else f"Step {group.step}"
+        status = group.status
+        filename = (
+            f"artifact-{_name_part(group.step)}-{digest[:8]}-{_name_part(status or 'unknown')}.md"
+        )
+        front_matter = _render_step_front_matter(
+            settings=settings, session_id=session_id, group=group, digest=digest
+        )
+        body = io.BytesIO(_render_step_body(group, contents).encode("utf-8"))
+        _write_artifact(artifacts_root / filename, front_matter, body)
+        _append_ingest_log(ingest_log, f"write artifact={filename} hash={digest[:8]}")
+        records.append(
+            ArtifactRecord(filename=filename, step=group.step, status=status, hash=digest)
         )
-        lines.append(step_label)
 
-        first_line: str | None = None
-        for event in group.events:
-            total_events += 1
-            ts = event.timestamp.astimezone(timezone.utc)
-            if first_timestamp is None or ts < first_timestamp:
-                first_timestamp = ts
-            if last_timestamp is None or ts > last_timestamp:
-                last_timestamp = ts
+    current = {record.filename for record in records}
+    for stale in sorted(artifacts_root.glob("artifact-*.md")):
+        if stale.name not in current:
+            stale.unlink()
+            _append_ingest_log(ingest_log, f"remove stale artifact={stale.name}")
+    return records, deduplicated
 
-            if first_line is not None:
-                continue
 
-            candidate = _summarise_content(event.content)
-            if candidate:
-                first_line = candidate
+CHECKPOINT_NAME = "run.checkpoint.json"
+_CHECKPOINT_VERSION = 2
 
-        if first_line is None:
-            first_line = "(no content)"
 
-        lines.append(first_line)
-        lines.append("")
+@dataclass(slots=True)
+class _IncrementalState:
+    raw_root: str
+    events_parsed: int = 0
+    sources: dict[str, SourceCheckpoint] = field(default_factory=dict)
+    steps: dict[str, _StepSummary] = field(default_factory=dict)
+
+
+def _load_checkpoint(path: Path, raw_root: Path) -> _IncrementalState | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != _CHECKPOINT_VERSION:
+        return None
+    if data.get("raw_root") != str(raw_root):
+        return None
+
+    try:
+        sources = {entry["name"]: SourceCheckpoint(**entry) for entry in data["sources"]}
+        steps = {}
+        for entry in data["steps"]:
+            summary_at = entry.get("summary_at")
+            summary_position = entry.get("summary_position")
+            steps[entry["step"]] = _StepSummary(
+                step=entry["step"],
+                summary=entry.get("summary"),
+                summary_at=datetime.fromisoformat(summary_at) if summary_at else None,
+                events=int(entry["events"]),
+                first_event=datetime.fromisoformat(entry["first_event"]),
+                last_event=datetime.fromisoformat(entry["last_event"]),
+                position=(str(entry["position"][0]), int(entry["position"][1])),
+                summary_position=(
+                    (str(summary_position[0]), int(summary_position[1]))
+                    if summary_position
+                    else None
+                ),
+            )
+        return _IncrementalState(
+            raw_root=str(raw_root),
+            events_parsed=int(data["events_parsed"]),
+            sources=sources,
+            steps=steps,
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _save_checkpoint(path: Path, state: _IncrementalState) -> None:
+    payload = {
+        "version": _CHECKPOINT_VERSION,
+        "raw_root": state.raw_root,
+        "events_parsed": state.events_parsed,
+        "sources": [asdict(checkpoint) for checkpoint in state.sources.values()],
+        "steps": [
+            {
+                "step": step.step,
+                "summary": step.summary,
+                "summary_at": step.summary_at.isoformat() if step.summary_at else None,
+                "events": step.events,
+                "first_event": step.first_event.isoformat(),
+                "last_event": step.last_event.isoformat(),
+                "position": list(step.position),
+                "summary_position": (
+                    list(step.summary_position) if step.summary_position else None
+                ),
+            }
+            for step in state.steps.values()
+        ],
+    }
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+    tmp_path.replace(path)
 
-    if not lines:
-        now = datetime.now(timezone.utc)
-        return "(no events captured)\n", 0, now, now
 
-    # Remove trailing blank line for neatness
-    while lines and lines[-1] == "":
-        lines.pop()
+def _apply_new_events(state: _IncrementalState, raw_root: Path) -> int:
+    order = _source_order(raw_root)
+    added = 0
+    for event in iter_appended_events(raw_root, state.sources, start_index=state.events_parsed):
+        added += 1
+        if not _is_bootstrap_step(event.step):
+            state.steps[event.step] = _add_event(state.steps.get(event.step), event, order)
+    state.events_parsed += added
+    return added
+
 
-    first_ts = first_timestamp or datetime.now(timezone.utc)
-    last_ts = last_timestamp or first_ts
-    return "\n".join(lines) + "\n", total_events, first_ts, last_ts
+def _read_manifest_records(manifest_path: Path) -> list[ArtifactRecord] | None:
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        return [ArtifactRecord(**entry) for entry in manifest["artifacts"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
 
 
 def _append_ingest_log(path: Path, message: str) -> None:
@@ -153,40 +550,130 @@ def distill_session(
     raw_root: Path,
     artifacts_root: Path,
     settings: Settings,
+    *,
+    streaming: bool = False,
+    incremental: bool = False,
+    per_step: bool = False,
 ) -> DistillationResult:
+    """Distill a raw session into a transcript artifact and ``run.json`` manifest.
+
+    With ``streaming`` the events are read and grouped incrementally, so peak
+    memory follows the largest step instead of the whole session. Steps are
+    then rendered in source order rather than sorted by their first timestamp.
+
+    With ``incremental`` per-source read positions and per-step summaries are
+    kept in ``run.checkpoint.json`` next to ``run.json``. Later runs only parse
+    appended ``events.jsonl`` lines and new ``events/*.json`` files, and fall
+    back to a full rebuild when a recorded source was truncated or rewritten.
+
+    With ``per_step`` one ``artifact-{step}-{hash8}-{status}.md`` is written
+    per step instead of the transcript; steps whose normalised content repeats
+    an earlier step are skipped and counted in ``deduplicated``.
+    """
+
+    if incremental and per_step:
+        raise DistillationError("incremental and per-step modes cannot be combined")
+
     raw_root = Path(raw_root)
     artifacts_root = Path(artifacts_root)
     artifacts_root.mkdir(parents=True, exist_ok=True)
 
-    groups = load_event_groups(raw_root)
-    if not groups:
-        raise DistillationError("no groups available for distillation")
-
     ingest_log = artifacts_root / "ingest.log"
     manifest_path = artifacts_root / "run.json"
-    content, total_events, first_event_ts, last_event_ts = _format_content(groups)
-    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
     artifact_name = "session-transcript.md"
     artifact_path = artifacts_root / artifact_name
-    front_matter = _render_front_matter(
-        settings=settings,
-        session_id=session_id,
-        events_count=total_events,
-        first_event=first_event_ts,
-        last_event=last_event_ts,
-        digest=digest,
-    )
-    artifact_path.write_text(front_matter + content, encoding="utf-8")
-    _append_ingest_log(ingest_log, f"write artifact={artifact_name} hash={digest[:8]}")
-
-    manifest_records = [
-        ArtifactRecord(
-            filename=artifact_name,
-            step="session",
-            status="complete",
-            hash=digest,
+
+    state: _IncrementalState | None = None
+    if incremental:
+        if streaming:
+            raise DistillationError("incremental and streaming modes cannot be combined")
+        checkpoint_path = artifacts_root / CHECKPOINT_NAME
+        raw_key = raw_root.resolve()
+        state = _load_checkpoint(checkpoint_path, raw_key)
+        if state is None:
+            state = _IncrementalState(raw_root=str(raw_key))
+        try:
+            added = _apply_new_events(state, raw_root)
+        except StaleCheckpointError as exc:
+            _append_ingest_log(ingest_log, f"checkpoint reset reason={exc}")
+            state = _IncrementalState(raw_root=str(raw_key))
+            added = _apply_new_events(state, raw_root)
+        if state.events_parsed == 0:
+            raise GroupingError(f"no events parsed from {raw_root}")
+
+        existing = _read_manifest_records(manifest_path) if artifact_path.exists() else None
+        if added == 0 and existing is not None:
+            _append_ingest_log(ingest_log, "incremental distill unchanged")
+            _save_checkpoint(checkpoint_path, state)
+            return DistillationResult(
+                session_id=session_id,
+                artifacts=existing,
+                artifacts_dir=artifacts_root,
+                manifest_path=manifest_path,
+                ingest_log=ingest_log,
+                deduplicated=0,
+            )
+
+        # Appended lines are read after the other sources, so equal timestamps are
+        # ordered by source position to match a full rebuild.
+        order = _source_order(raw_root)
+        steps: Iterable[_StepSummary] = sorted(
+            state.steps.values(), key=lambda step: (step.first_event, order(step.position))
         )
-    ]
+    else:
+        groups: Iterable[EventGroup]
+        workers = settings.parse_workers
+        if streaming:
+            # The event cache is decoded as a whole, so streaming always reads the sources.
+            groups = iter_event_groups(raw_root, workers=workers, lazy=settings.lazy_content)
+        else:
+            if settings.lazy_content:
+                # Cached and compact events carry their content, so lazy mode reads the sources.
+                groups = load_event_groups(raw_root, workers=workers, lazy=True)
+            elif settings.compact_events and settings.event_cache:
+                groups = load_store(raw_root, workers=workers).groups()
+            elif settings.compact_events:
+                groups = EventStore.from_events(iter_events(raw_root, workers=workers)).groups()
+            elif settings.event_cache:
+                groups = group_events(load_events(raw_root, workers=workers))
+            else:
+                groups = load_event_groups(raw_root, workers=workers)
+            if not groups:
+                raise DistillationError("no groups available for distillation")
+        steps = _summarise_groups(groups)
+
+    deduplicated = 0
+    if per_step:
+        manifest_records, deduplicated = _write_step_artifacts(
+            groups,
+            artifacts_root,
+            settings=settings,
+            session_id=session_id,
+            ingest_log=ingest_log,
+        )
+    else:
+        # The body goes to a scratch file first because the front matter needs its digest.
+        with tempfile.TemporaryFile(dir=artifacts_root) as body:
+            digest, total_events, first_event_ts, last_event_ts = _write_steps(body, steps)
+            front_matter = _render_front_matter(
+                settings=settings,
+                session_id=session_id,
+                events_count=total_events,
+                first_event=first_event_ts,
+                last_event=last_event_ts,
+                digest=digest,
+            )
+            _write_artifact(artifact_path, front_matter, body)
+        _append_ingest_log(ingest_log, f"write artifact={artifact_name} hash={digest[:8]}")
+
+        manifest_records = [
+            ArtifactRecord(
+                filename=artifact_name,
+                step="session",
+                status="complete",
+                hash=digest,
+            )
+        ]
 
     manifest = {
         "session": session_id,
@@ -201,17 +688,22 @@ def distill_session(
     manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
     _append_ingest_log(ingest_log, f"manifest updated count={len(manifest_records)}")
 
+    if state is not None:
+        _save_checkpoint(artifacts_root / CHECKPOINT_NAME, state)
+        _append_ingest_log(ingest_log, f"checkpoint saved events={state.events_parsed}")
+
     return DistillationResult(
         session_id=session_id,
         artifacts=manifest_records,
         artifacts_dir=artifacts_root,
         manifest_path=manifest_path,
         ingest_log=ingest_log,
-        deduplicated=0,
+        deduplicated=deduplicated,
     )
 
 
 __all__ = [
+    "CHECKPOINT_NAME",
     "ArtifactRecord",
     "DistillationError",
     "DistillationResult",
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Sequence
+
+# Clients on different threads share one cache file; their read-merge-write
+# cycles are serialised so no entry is lost.
+_SAVE_LOCK = threading.Lock()
+
+
+def default_cache_path() -> Path:
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(cache_home) / "oh2webui" / "endpoints.json"
+
+
+class EndpointCache:
+    """Remember which candidate route works for each operation on one Open WebUI server.
+
+    Entries are keyed by base URL and server version and expire after ``ttl``
+    seconds. With ``path`` set, learned routes are persisted so later runs go
+    straight to the working endpoint instead of retrying on 404/405.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        version: str,
+        path: Path | None = None,
+        ttl: float = 86400.0,
+    ) -> None:
+        self.key = f"{base_url.rstrip('/')}|{version}"
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._routes: dict[str, str] = {}
+        self._load()
+
+    def _read_entries(self) -> dict:
+        if self.path is None:
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        entries = data.get("entries") if isinstance(data, dict) else None
+        return entries if isinstance(entries, dict) else {}
+
+    def _load(self) -> None:
+        entry = self._read_entries().get(self.key)
+        if not isinstance(entry, dict):
+            return
+        saved_at = entry.get("saved_at")
+        if not isinstance(saved_at, (int, float)) or time.time() - saved_at > self.ttl:
+            return
+        routes = entry.get("routes")
+        if isinstance(routes, dict):
+            self._routes = {str(op): str(route) for op, route in routes.items()}
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        with _SAVE_LOCK:
+            entries = self._read_entries()
+            entries[self.key] = {"saved_at": time.time(), "routes": dict(self._routes)}
+            tmp_name: str | None = None
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with tempfile.NamedTemporaryFile(
+                    "w",
+                    encoding="utf-8",
+                    dir=self.path.parent,
+                    prefix=f"{self.path.name}.",
+                    suffix=".tmp",
+                    delete=False,
+                ) as handle:
+                    tmp_name = handle.name
+                    handle.write(json.dumps({"entries": entries}, indent=2))
+                os.replace(tmp_name, self.path)
+            except OSError:
+                # The cache is an optimisation; an unwritable location must not fail a run.
+                if tmp_name is not None:
+                    Path(tmp_name).unlink(missing_ok=True)
+
+    def order(self, operation: str, candidates: Sequence[str]) -> list[str]:
+        """Return ``candidates`` with the remembered route for ``operation`` first."""
+
+        with self._lock:
+            known = self._routes.get(operation)
+        if known in candidates:
+            return [known] + [candidate for candidate in candidates if candidate != known]
+        return list(candidates)
+
+    def remember(self, operation: str, route: str) -> None:
+        with self._lock:
+            if self._routes.get(operation) == route:
+                return
+            self._routes[operation] = route
+            self._save()
+
+
+__all__ = ["EndpointCache", "default_cache_path"]
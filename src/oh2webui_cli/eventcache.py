@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import gc
+import json
+import os
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .eventstore import EventStore
+from .grouper import Event, find_event_sources, iter_events
+from .jsonbackend import active_backend
+
+CACHE_NAME = ".events.cache"
+_MAGIC = b"OH2EVC\x01\n"
+_HEADER = struct.Struct("<I")
+_CACHE_VERSION = 1
+
+_EPOCH = datetime(1970, 1, 1)
+_NAIVE = -(2**31)
+_NO_STATUS = -1
+
+# Column order on disk; every column but the two blobs is an ``array`` of this typecode.
+_COLUMNS = (
+    ("step", "I"),
+    ("role", "I"),
+    ("status", "i"),
+    ("micros", "q"),
+    ("utcoffset", "i"),
+    ("content_end", "Q"),
+    ("content", None),
+    ("metadata", None),
+)
+
+
+def _source_key(raw_root: Path) -> list[list]:
+    key = []
+    for source in find_event_sources(raw_root):
+        stat = source.stat()
+        key.append([source.relative_to(raw_root).as_posix(), stat.st_size, stat.st_mtime_ns])
+    return key
+
+
+def _encode_timestamp(value: datetime) -> tuple[int, int]:
+    offset = value.utcoffset()
+    local = value.replace(tzinfo=None)
+    delta = local - _EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    if offset is None:
+        return micros, _NAIVE
+    return micros, int(offset.total_seconds())
+
+
+def _epoch_in(utcoffset: int) -> datetime:
+    """Return 1970-01-01 00:00 wall time in the zone ``utcoffset`` (naive for ``_NAIVE``)."""
+
+    if utcoffset == _NAIVE:
+        return _EPOCH
+    return _EPOCH.replace(tzinfo=timezone(timedelta(seconds=utcoffset)))
+
+
+def _read_columns(path: Path, key: list[list]) -> Optional[tuple[list[str], dict]]:
+    try:
+        data = memoryview(path.read_bytes())
+    except OSError:
+        return None
+    if data[: len(_MAGIC)] != _MAGIC:
+        return None
+    position = len(_MAGIC)
+    try:
+        (header_size,) = _HEADER.unpack_from(data, position)
+        position += _HEADER.size
+        header = json.loads(bytes(data[position : position + header_size]))
+        position += header_size
+        if (
+            not isinstance(header, dict)
+            or header.get("version") != _CACHE_VERSION
+            or header.get("byteorder") != sys.byteorder
+            or header.get("sources") != key
+            or len(header["sizes"]) != len(_COLUMNS)
+            or sum(header["sizes"]) != len(data) - position
+        ):
+            return None
+
+        columns: dict = {}
+        for (name, typecode), size in zip(_COLUMNS, header["sizes"]):
+            chunk = data[position : position + size]
+            position += size
+            if typecode is None:
+                columns[name] = bytes(chunk)
+            else:
+                column = array(typecode)
+                column.frombytes(chunk)
+                if len(column) != header["count"]:
+                    return None
+                columns[name] = column
+        strings = header["strings"]
+    except (struct.error, KeyError, TypeError, ValueError):
+        return None
+    if not isinstance(strings, list):
+        return None
+    return strings, columns
+
+
+@contextmanager
+def _paused_gc() -> Iterator[None]:
+    # Decoding allocates millions of acyclic objects; pausing the cyclic
+    # collector avoids repeated full-heap scans while they are built.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _read(path: Path, key: list[list]) -> Optional[list[Event]]:
+    cached = _read_columns(path, key)
+    if cached is None:
+        return None
+    try:
+        with _paused_gc():
+            return _decode_events(*cached)
+    except Exception:  # a corrupt cache is a miss; the sources are parsed again
+        return None
+
+
+def _read_store(path: Path, key: list[list]) -> Optional[EventStore]:
+    cached = _read_columns(path, key)
+    if cached is None:
+        return None
+    try:
+        return _decode_store(*cached)
+    except Exception:  # a corrupt cache is a miss; the sources are parsed again
+        return None
+
+
+def _check_metadata(metadata: object, columns: dict) -> None:
+    if not isinstance(metadata, list) or len(metadata) != len(columns["step"]):
+        raise ValueError("cached metadata does not match the event columns")
+
+
+def _decode_store(strings: list[str], columns: dict) -> EventStore:
+    content = columns["content"].decode("utf-8")
+    store = EventStore()
+    with _paused_gc():
+        metadata = active_backend().loads(columns["metadata"])
+        _check_metadata(metadata, columns)
+        start = 0
+        for step, role, status, micros, utcoffset, end, event_metadata in zip(
+            columns["step"],
+            columns["role"],
+            columns["status"],
+            columns["micros"],
+            columns["utcoffset"],
+            columns["content_end"],
+            metadata,
+        ):
+            naive = utcoffset == _NAIVE
+            store.append_row(
+                strings[step],
+                strings[role],
+                content[start:end],
+                (micros if naive else micros - utcoffset * 1_000_000) / 1_000_000,
+                None if naive else utcoffset,
+                None if status == _NO_STATUS else strings[status],
+                event_metadata,
+            )
+            start = end
+    return store
+
+
+def _decode_events(strings: list[str], columns: dict) -> list[Event]:
+    content = columns["content"].decode("utf-8")
+    metadata = active_backend().loads(columns["metadata"])
+    _check_metadata(metadata, columns)
+    # Adding wall-clock microseconds to a per-zone epoch avoids building a
+    # timezone object for every event.
+    epochs = {utcoffset: _epoch_in(utcoffset) for utcoffset in set(columns["utcoffset"])}
+    events: list[Event] = []
+    start = 0
+    for step, role, status, micros, utcoffset, end, event_metadata in zip(
+        columns["step"],
+        columns["role"],
+        columns["status"],
+        columns["micros"],
+        columns["utcoffset"],
+        columns["content_end"],
+        metadata,
+    ):
+        events.append(
+            Event(
+                step=strings[step],
+                role=strings[role],
+                content=content[start:end],
+                timestamp=epochs[utcoffset] + timedelta(0, 0, micros),
+                status=None if status == _NO_STATUS else strings[status],
+                metadata=event_metadata,
+            )
+        )
+        start = end
+    return events
+
+
+def _write(path: Path, key: list[list], events: Iterable[Event]) -> None:
+    strings: dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        return strings.setdefault(value, len(strings))
+
+    steps, roles, statuses = array("I"), array("I"), array("i")
+    micros, offsets, content_ends = array("q"), array("i"), array("Q")
+    contents: list[str] = []
+    metadata: list[dict] = []
+    content_length = 0
+    for event in events:
+        steps.append(intern(event.step))
+        roles.append(intern(event.role))
+        statuses.append(_NO_STATUS if event.status is None else intern(event.status))
+        timestamp, utcoffset = _encode_timestamp(event.timestamp)
+        micros.append(timestamp)
+        offsets.append(utcoffset)
+        contents.append(event.content)
+        content_length += len(event.content)
+        content_ends.append(content_length)
+        metadata.append(event.metadata)
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        blobs = [
+            steps.tobytes(),
+            roles.tobytes(),
+            statuses.tobytes(),
+            micros.tobytes(),
+            offsets.tobytes(),
+            content_ends.tobytes(),
+            "".join(contents).encode("utf-8"),
+            json.dumps(metadata, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        ]
+        header = json.dumps(
+            {
+                "version": _CACHE_VERSION,
+                "byteorder": sys.byteorder,
+                "sources": key,
+                "count": len(steps),
+                "strings": list(strings),
+                "sizes": [len(blob) for blob in blobs],
+            }
+        ).encode("utf-8")
+        with tmp_path.open("wb") as handle:
+            handle.write(_MAGIC)
+            handle.write(_HEADER.pack(len(header)))
+            handle.write(header)
+            for blob in blobs:
+                handle.write(blob)
+        tmp_path.replace(path)
+    except (OSError, TypeError, ValueError):
+        # The cache is an optimisation; a read-only raw directory or content
+        # that cannot be serialised (unencodable text, non-JSON metadata)
+        # must not fail the distill.
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_events(raw_root: Path, *, workers: int = 1) -> list[Event]:
+    """Return the normalised events of a raw session, using the on-disk cache when current.
+
+    The cache lives in ``raw_root / CACHE_NAME`` and is keyed by the size and
+    mtime of every event source, so any change to the sources rebuilds it. A
+    cache that cannot be decoded is treated as missing and rewritten.
+    """
+
+    raw_root = Path(raw_root)
+    key = _source_key(raw_root)
+    cache_path = raw_root / CACHE_NAME
+    events = _read(cache_path, key)
+    if events is None:
+        events = list(iter_events(raw_root, workers=workers))
+        _write(cache_path, key, events)
+    return events
+
+
+def load_store(raw_root: Path, *, workers: int = 1) -> EventStore:
+    """Like :func:`load_events`, but fill a compact :class:`EventStore` instead of a list."""
+
+    raw_root = Path(raw_root)
+    key = _source_key(raw_root)
+    cache_path = raw_root / CACHE_NAME
+    store = _read_store(cache_path, key)
+    if store is None:
+        store = EventStore.from_events(iter_events(raw_root, workers=workers))
+        _write(cache_path, key, store)
+    return store
+
+
+__all__ = ["CACHE_NAME", "load_events", "load_store"]
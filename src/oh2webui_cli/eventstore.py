@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Iterator, Optional, Sequence, overload
+
+from .grouper import Event, EventGroup
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+_NAIVE = -(2**31)
+_NO_STATUS = -1
+# Short metadata strings (sources, commands, cwd) repeat across events and are interned.
+_INTERN_MAX = 64
+
+
+class EventStore:
+    """Append-only, column-oriented store of normalised events.
+
+    Step, role and status strings are interned into one table and referenced
+    by index, timestamps are kept as POSIX seconds in an ``array`` of floats
+    (naive datetimes as if they were UTC), and metadata dicts are split into a
+    shared key tuple per distinct shape plus a tuple of values per event.
+
+    ``Event`` objects are only built on access, so iterating a store or a
+    group from :meth:`groups` yields fresh objects each time.
+    """
+
+    __slots__ = (
+        "_strings",
+        "_string_ids",
+        "_steps",
+        "_roles",
+        "_statuses",
+        "_timestamps",
+        "_utcoffsets",
+        "_contents",
+        "_shapes",
+        "_shape_ids",
+        "_shape_of",
+        "_values",
+        "_zones",
+    )
+
+    def __init__(self) -> None:
+        self._strings: list[str] = []
+        self._string_ids: dict[str, int] = {}
+        self._steps = array("I")
+        self._roles = array("I")
+        self._statuses = array("i")
+        self._timestamps = array("d")
+        self._utcoffsets = array("i")
+        self._contents: list[str] = []
+        self._shapes: list[tuple[str, ...]] = []
+        self._shape_ids: dict[tuple[str, ...], int] = {}
+        self._shape_of = array("I")
+        self._values: list[tuple[Any, ...]] = []
+        self._zones: dict[int, Optional[timezone]] = {_NAIVE: None}
+
+    @classmethod
+    def from_events(cls, events: Iterable[Event]) -> "EventStore":
+        store = cls()
+        store.extend(events)
+        return store
+
+    def _intern(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+
+    def _zone(self, utcoffset: int) -> Optional[timezone]:
+        try:
+            return self._zones[utcoffset]
+        except KeyError:
+            zone = self._zones[utcoffset] = timezone(timedelta(seconds=utcoffset))
+            return zone
+
+    def append_row(
+        self,
+        step: str,
+        role: str,
+        content: str,
+        seconds: float,
+        utcoffset: Optional[int],
+        status: Optional[str],
+        metadata: dict,
+    ) -> None:
+        """Append one event from raw fields.
+
+        ``seconds`` is the POSIX timestamp and ``utcoffset`` the zone offset in
+        seconds; for naive datetimes pass ``None`` and the seconds since
+        1970-01-01 as if the value were UTC.
+        """
+
+        self._steps.append(self._intern(step))
+        self._roles.append(self._intern(role))
+        self._statuses.append(_NO_STATUS if status is None else self._intern(status))
+        self._timestamps.append(seconds)
+        self._utcoffsets.append(_NAIVE if utcoffset is None else utcoffset)
+        self._contents.append(content)
+
+        shape = tuple(metadata)
+        shape_id = self._shape_ids.get(shape)
+        if shape_id is None:
+            shape_id = self._shape_ids[shape] = len(self._shapes)
+            self._shapes.append(shape)
+        self._shape_of.append(shape_id)
+        self._values.append(
+            tuple(
+                sys.intern(value) if type(value) is str and len(value) <= _INTERN_MAX else value
+                for value in metadata.values()
+            )
+        )
+
+    def append(self, event: Event) -> None:
+        timestamp = event.timestamp
+        offset = timestamp.utcoffset()
+        utcoffset: Optional[int]
+        if offset is None:
+            seconds, utcoffset = (timestamp - _EPOCH) / _SECOND, None
+        else:
+            seconds, utcoffset = timestamp.timestamp(), int(offset.total_seconds())
+        self.append_row(
+            event.step,
+            event.role,
+            event.content,
+            seconds,
+            utcoffset,
+            event.status,
+            event.metadata,
+        )
+
+    def extend(self, events: Iterable[Event]) -> None:
+        for event in events:
+            self.append(event)
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    def _timestamp(self, index: int) -> datetime:
+        seconds = self._timestamps[index]
+        zone = self._zone(self._utcoffsets[index])
+        if zone is None:
+            return _EPOCH + timedelta(seconds=seconds)
+        return datetime.fromtimestamp(seconds, zone)
+
+    def event(self, index: int) -> Event:
+        """Materialise the event stored at ``index``."""
+
+        status = self._statuses[index]
+        return Event(
+            step=self._strings[self._steps[index]],
+            role=self._strings[self._roles[index]],
+            content=self._contents[index],
+            timestamp=self._timestamp(index),
+            status=None if status == _NO_STATUS else self._strings[status],
+            metadata=dict(zip(self._shapes[self._shape_of[index]], self._values[index])),
+        )
+
+    def __getitem__(self, index: int) -> Event:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("event index out of range")
+        return self.event(index)
+
+    def __iter__(self) -> Iterator[Event]:
+        return map(self.event, range(len(self)))
+
+    def groups(self) -> list[EventGroup]:
+        """Group events by step like :func:`grouper.group_events`, backed by this store."""
+
+        members: dict[int, array] = {}
+        earliest: dict[int, float] = {}
+        for index, (step, seconds) in enumerate(zip(self._steps, self._timestamps)):
+            indices = members.get(step)
+            if indices is None:
+                members[step] = array("I", [index])
+                earliest[step] = seconds
+                continue
+            indices.append(index)
+            if seconds < earliest[step]:
+                earliest[step] = seconds
+
+        timestamps = self._timestamps
+        groups: list[EventGroup] = []
+        for step in sorted(members, key=earliest.__getitem__):
+            ordered = array("I", sorted(members[step], key=timestamps.__getitem__))
+            groups.append(
+                EventGroup(
+                    step=self._strings[step],
+                    events=EventView(self, ordered),  # type: ignore[arg-type]
+                    started_at=self._timestamp(ordered[0]),
+                    completed_at=self._timestamp(ordered[-1]),
+                )
+            )
+        return groups
+
+
+class EventView(Sequence[Event]):
+    """Read-only sequence of events selected from an :class:`EventStore` by index."""
+
+    __slots__ = ("_store", "_indices")
+
+    def __init__(self, store: EventStore, indices: array) -> None:
+        self._store = store
+        self._indices = indices
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    @overload
+    def __getitem__(self, index: int) -> Event: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "EventView": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return EventView(self._store, self._indices[index])
+        return self._store.event(self._indices[index])
+
+    def __iter__(self) -> Iterator[Event]:
+        return map(self._store.event, self._indices)
+
+    def __reversed__(self) -> Iterator[Event]:
+        return map(self._store.event, reversed(self._indices))
+
+
+__all__ = ["EventStore", "EventView"]
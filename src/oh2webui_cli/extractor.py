@@ -1,20 +1,248 @@
 from __future__ import annotations
 
+import hashlib
+import os
 import shutil
+import sys
 from dataclasses import dataclass
+from fnmatch import fnmatch
 from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence
+
+from .grouper import GroupingError, find_event_sources
 
 
 class ExtractionError(RuntimeError):
     """Raised when the requested session cannot be extracted."""
 
 
+EXTRACTION_MODES = ("copy", "auto", "reflink", "hardlink", "symlink")
+
+# Linux ioctl that clones a file's extents (btrfs, XFS, bcachefs, ...).
+_FICLONE = 0x40049409
+
+
 @dataclass(slots=True)
 class ExtractionResult:
     session_id: str
     source: Path
     destination: Path
     copied: bool
+    mode: str = "copy"
+    files_linked: int = 0
+    files_copied: int = 0
+    files_skipped: int = 0
+    bytes_skipped: int = 0
+    files_transferred: int = 0
+    bytes_transferred: int = 0
+    files_appended: int = 0
+
+
+def _reflink(src: str, dst: str) -> None:
+    if not sys.platform.startswith("linux"):
+        raise OSError("reflinks are only supported on Linux")
+    import fcntl
+
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        try:
+            fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+        except OSError:
+            target.close()
+            os.unlink(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def _hardlink(src: str, dst: str) -> None:
+    os.link(src, dst)
+
+
+def _symlink(src: str, dst: str) -> None:
+    os.symlink(os.path.abspath(src), dst)
+
+
+_LINKERS = {
+    "reflink": (_reflink,),
+    "hardlink": (_hardlink,),
+    "symlink": (_symlink,),
+    "auto": (_reflink, _hardlink),
+}
+
+
+class _LinkingCopier:
+    """``copytree`` copy function that links files when possible and copies otherwise."""
+
+    def __init__(self, mode: str) -> None:
+        self.linkers = list(_LINKERS.get(mode, ()))
+        self.linked = 0
+        self.copied = 0
+        self.bytes_copied = 0
+
+    def __call__(self, src: str, dst: str) -> str:
+        for linker in list(self.linkers):
+            try:
+                linker(src, dst)
+            except OSError:
+                # Unsupported here (cross-device, filesystem without reflinks, ...);
+                # stop trying this strategy for the rest of the tree.
+                self.linkers.remove(linker)
+                continue
+            self.linked += 1
+            return dst
+        shutil.copy2(src, dst)
+        self.copied += 1
+        self.bytes_copied += os.stat(dst).st_size
+        return dst
+
+
+def _iter_session_files(root: Path) -> Iterator[tuple[str, Path]]:
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = Path(directory) / filename
+            yield path.relative_to(root).as_posix(), path
+
+
+def _selection(
+    source_path: Path, selective: bool, include: Sequence[str]
+) -> Optional[Callable[[str], bool]]:
+    """Return a predicate over relative paths for selective mode, or ``None`` for everything."""
+
+    if not (selective or include):
+        return None
+    try:
+        wanted = {
+            source.relative_to(source_path).as_posix() for source in find_event_sources(source_path)
+        }
+    except GroupingError as exc:
+        raise ExtractionError(str(exc)) from exc
+
+    def selected(relative: str) -> bool:
+        return relative in wanted or any(fnmatch(relative, pattern) for pattern in include)
+
+    return selected
+
+
+def _copy_selected(
+    source_path: Path,
+    destination_path: Path,
+    copier: _LinkingCopier,
+    selected: Callable[[str], bool],
+) -> tuple[int, int]:
+    destination_path.mkdir()
+    files_skipped = 0
+    bytes_skipped = 0
+    for relative, path in _iter_session_files(source_path):
+        if selected(relative):
+            target = destination_path / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            copier(str(path), str(target))
+        else:
+            files_skipped += 1
+            bytes_skipped += path.stat().st_size
+    return files_skipped, bytes_skipped
+
+
+_HASH_CHUNK = 1 << 20
+# Bytes compared just before the previous end of a JSONL file to detect rewrites.
+_APPEND_PROBE = 4096
+
+
+def _digest(path: Path, limit: Optional[int] = None) -> str:
+    digest = hashlib.sha256()
+    remaining = limit
+    with path.open("rb") as handle:
+        while remaining is None or remaining > 0:
+            size = _HASH_CHUNK if remaining is None else min(_HASH_CHUNK, remaining)
+            chunk = handle.read(size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def _read_range(path: Path, offset: int, length: int) -> bytes:
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        return handle.read(length)
+
+
+def _is_append(source: Path, target: Path, target_size: int, checksum: bool) -> bool:
+    """Return whether ``target`` still holds an unchanged prefix of ``source``."""
+
+    if checksum:
+        return _digest(source, target_size) == _digest(target, target_size)
+    start = max(0, target_size - _APPEND_PROBE)
+    return _read_range(source, start, target_size - start) == _read_range(
+        target, start, target_size - start
+    )
+
+
+def _append_from(source: Path, target: Path, offset: int) -> int:
+    with source.open("rb") as reader, target.open("ab") as writer:
+        reader.seek(offset)
+        shutil.copyfileobj(reader, writer, _HASH_CHUNK)
+    shutil.copystat(source, target)
+    return target.stat().st_size - offset
+
+
+def _replace(source: Path, target: Path, copier: _LinkingCopier) -> None:
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    copier(str(source), str(tmp_path))
+    os.replace(tmp_path, target)
+
+
+def _sync_tree(
+    source_path: Path,
+    destination_path: Path,
+    copier: _LinkingCopier,
+    selected: Optional[Callable[[str], bool]],
+    checksum: bool,
+) -> tuple[int, int, int, int]:
+    """Bring an existing extraction up to date with its source.
+
+    Returns ``(files_skipped, bytes_skipped, files_appended, bytes_appended)``;
+    new and replaced files are counted by ``copier``.
+    """
+
+    files_skipped = bytes_skipped = files_appended = bytes_appended = 0
+    for relative, path in _iter_session_files(source_path):
+        stat = path.stat()
+        if selected is not None and not selected(relative):
+            files_skipped += 1
+            bytes_skipped += stat.st_size
+            continue
+
+        target = destination_path / relative
+        if not target.exists() and not target.is_symlink():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            copier(str(path), str(target))
+            continue
+        if os.path.samefile(path, target):
+            # Hard- or symlinked to the source: already current, and writing
+            # through the link would modify the stored session.
+            continue
+
+        target_stat = target.stat()
+        if target_stat.st_size == stat.st_size:
+            if checksum:
+                if _digest(path) == _digest(target):
+                    continue
+            elif target_stat.st_mtime_ns == stat.st_mtime_ns:
+                continue
+        elif (
+            relative.endswith(".jsonl")
+            and not target.is_symlink()
+            and target_stat.st_size < stat.st_size
+            and _is_append(path, target, target_stat.st_size, checksum)
+        ):
+            files_appended += 1
+            bytes_appended += _append_from(path, target, target_stat.st_size)
+            continue
+        _replace(path, target, copier)
+    return files_skipped, bytes_skipped, files_appended, bytes_appended
 
 
 def extract_session(
@@ -23,13 +251,40 @@ def extract_session(
     destination: Path,
     *,
     overwrite: bool = False,
+    mode: str = "copy",
+    selective: bool = False,
+    include: Sequence[str] = (),
+    sync: bool = False,
+    checksum: bool = False,
 ) -> ExtractionResult:
     """Copy a stored OpenHands session into the working directory.
 
     The command is idempotent – existing destinations are reused unless
     ``overwrite`` is explicit.
+
+    ``mode`` selects how files are materialised: ``copy`` duplicates them,
+    ``reflink`` clones extents on copy-on-write filesystems, ``hardlink`` and
+    ``symlink`` link back to the stored session, and ``auto`` tries reflinks,
+    then hardlinks. Files that cannot be linked are copied. Linked files share
+    storage with the source, so the extracted tree must be treated as read-only.
+
+    With ``selective`` (implied by a non-empty ``include``) only the event
+    sources the grouper reads are extracted, plus any relative paths matching
+    the ``include`` glob patterns; everything else is counted as skipped.
+
+    With ``sync`` an existing destination is updated in place instead of being
+    reused: new files are materialised, files whose size or mtime differ (or
+    whose content hash differs with ``checksum``) are replaced, and JSONL
+    files that only grew are appended to from their previous length. Files
+    linked to the source are left alone, and files removed from the source
+    are kept.
     """
 
+    if mode not in EXTRACTION_MODES:
+        raise ExtractionError(f"unknown extraction mode '{mode}'")
+    if sync and overwrite:
+        raise ExtractionError("sync and overwrite cannot be combined")
+
     source_path = (Path(source_root) / session_id).expanduser()
     destination_path = Path(destination).expanduser()
 
@@ -38,25 +293,49 @@ def extract_session(
 
     destination_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if destination_path.exists() and not overwrite:
+    if destination_path.exists() and not (overwrite or sync):
         return ExtractionResult(
             session_id=session_id,
             source=source_path,
             destination=destination_path,
             copied=False,
+            mode=mode,
         )
 
-    if destination_path.exists() and overwrite:
-        shutil.rmtree(destination_path)
-
-    shutil.copytree(source_path, destination_path, dirs_exist_ok=False)
+    copier = _LinkingCopier(mode)
+    selected = _selection(source_path, selective, include)
+    files_skipped = bytes_skipped = files_appended = bytes_appended = 0
+    if destination_path.exists() and sync:
+        files_skipped, bytes_skipped, files_appended, bytes_appended = _sync_tree(
+            source_path, destination_path, copier, selected, checksum
+        )
+        synced = True
+    else:
+        if destination_path.exists():
+            shutil.rmtree(destination_path)
+        if selected is not None:
+            files_skipped, bytes_skipped = _copy_selected(
+                source_path, destination_path, copier, selected
+            )
+        else:
+            shutil.copytree(source_path, destination_path, copy_function=copier)
+        synced = False
 
+    files_transferred = copier.linked + copier.copied + files_appended
     return ExtractionResult(
         session_id=session_id,
         source=source_path,
         destination=destination_path,
-        copied=True,
+        copied=files_transferred > 0 or not synced,
+        mode=mode,
+        files_linked=copier.linked,
+        files_copied=copier.copied,
+        files_skipped=files_skipped,
+        bytes_skipped=bytes_skipped,
+        files_transferred=files_transferred,
+        bytes_transferred=copier.bytes_copied + bytes_appended,
+        files_appended=files_appended,
     )
 
 
-__all__ = ["ExtractionError", "ExtractionResult", "extract_session"]
+__all__ = ["EXTRACTION_MODES", "ExtractionError", "ExtractionResult", "extract_session"]
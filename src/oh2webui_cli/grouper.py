@@ -1,17 +1,26 @@
 from __future__ import annotations
 
-import json
-from collections import defaultdict
+import hashlib
+import mmap
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import groupby
 from pathlib import Path
-from typing import Any, Iterable, List, Optional
+from typing import Any, Iterable, Iterator, List, Optional
+
+from .jsonbackend import active_backend, get_backend
 
 
 class GroupingError(RuntimeError):
     """Raised when events cannot be grouped for distillation."""
 
 
+class StaleCheckpointError(GroupingError):
+    """Raised when recorded source checkpoints no longer match the raw session."""
+
+
 @dataclass(slots=True)
 class Event:
     step: str
@@ -22,70 +31,293 @@ class Event:
     metadata: dict = field(default_factory=dict)
 
 
+_CONTENT_KEYS = ("content", "message", "text", "summary")
+# Event content at least this long is left in the source and read back on access in lazy mode.
+_LAZY_MIN_CHARS = 4096
+
+
+def _select_content(raw: dict) -> str:
+    for key in _CONTENT_KEYS:
+        value = raw.get(key)
+        if value:
+            return str(value)
+    return ""
+
+
+@dataclass(frozen=True, slots=True)
+class ContentRef:
+    """Location of an event's content: the byte span of the one record holding it.
+
+    ``length`` of -1 reads to the end of the file.
+    """
+
+    path: str
+    offset: int
+    length: int
+
+    def load(self) -> str:
+        with open(self.path, "rb") as handle:
+            handle.seek(self.offset)
+            data = handle.read(self.length)
+        return _select_content(active_backend().loads(data))
+
+
+def _defer_content(record: Any, ref: ContentRef) -> None:
+    """Swap long content in ``record`` for ``ref`` so the string can be freed."""
+
+    if isinstance(record, dict) and len(_select_content(record)) >= _LAZY_MIN_CHARS:
+        for key in _CONTENT_KEYS:
+            record.pop(key, None)
+        record["__content_ref"] = ref
+
+
+_CONTENT_SLOT = Event.__dict__["content"]
+
+
+class LazyEvent(Event):
+    """An :class:`Event` whose ``content`` is read back from its source on each access.
+
+    Nothing is cached, so holding many lazy events keeps only their
+    :class:`ContentRef`; assigning ``content`` makes the event eager. Every
+    access re-opens the source and decodes the whole record, so callers should
+    read ``content`` once into a local rather than repeatedly.
+    """
+
+    __slots__ = ("content_ref",)
+
+    def __init__(
+        self,
+        step: str,
+        role: str,
+        content_ref: ContentRef,
+        timestamp: datetime,
+        status: Optional[str] = None,
+        metadata: Optional[dict] = None,
+    ) -> None:
+        self.content_ref = content_ref
+        if metadata is None:
+            metadata = {}
+        # ``None`` in the content slot means "not loaded"; see the property below.
+        unloaded: Any = None
+        Event.__init__(self, step, role, unloaded, timestamp, status, metadata)
+
+    @property  # type: ignore[override]
+    def content(self) -> str:
+        value = _CONTENT_SLOT.__get__(self, Event)
+        return self.content_ref.load() if value is None else value
+
+    @content.setter
+    def content(self, value: str) -> None:
+        _CONTENT_SLOT.__set__(self, value)
+
+
+@dataclass(slots=True)
+class SourceCheckpoint:
+    """Read position of one event source, relative to the raw session root."""
+
+    name: str
+    size: int
+    mtime_ns: int
+    offset: int = 0
+    last_index: int = 0
+    tail: str = ""
+    open_line: bool = False
+
+
+# Marks a derived ``EventGroup`` value that has not been computed yet (``None`` is a valid value).
+_UNSET: Any = object()
+
+
 @dataclass(slots=True)
 class EventGroup:
-    step: str
-    events: List[Event]
+    """Events of one step, ordered by timestamp.
 
-    @property
-    def started_at(self) -> datetime:
-        return min(event.timestamp for event in self.events)
+    ``started_at``/``completed_at`` are derived from ``events`` at construction
+    when not supplied, and ``status``, ``tags``, ``cwd`` and ``title`` are
+    computed on first access and cached; replace the group rather than
+    mutating ``events``.
+    """
 
-    @property
-    def completed_at(self) -> datetime:
-        return max(event.timestamp for event in self.events)
+    step: str
+    events: List[Event]
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    _status: Any = field(default=_UNSET, init=False, repr=False, compare=False)
+    _tags: Any = field(default=_UNSET, init=False, repr=False, compare=False)
+    _cwd: Any = field(default=_UNSET, init=False, repr=False, compare=False)
+    _title: Any = field(default=_UNSET, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.events and self.started_at is None:
+            self.started_at = min(event.timestamp for event in self.events)
+        if self.events and self.completed_at is None:
+            self.completed_at = max(event.timestamp for event in self.events)
 
     @property
     def status(self) -> Optional[str]:
-        for event in reversed(self.events):
-            if event.status:
-                return event.status
-        return None
+        if self._status is _UNSET:
+            self._status = next(
+                (event.status for event in reversed(self.events) if event.status), None
+            )
+        return self._status
 
     @property
     def tags(self) -> list[str]:
-        collected: set[str] = set()
-        for event in self.events:
-            tags = event.metadata.get("tags")
-            if isinstance(tags, str):
-                collected.update(tag.strip() for tag in tags.split(",") if tag.strip())
-            elif isinstance(tags, Iterable):
-                collected.update(str(tag) for tag in tags)
-        return sorted(collected)
+        if self._tags is _UNSET:
+            collected: set[str] = set()
+            for event in self.events:
+                tags = event.metadata.get("tags")
+                if isinstance(tags, str):
+                    collected.update(tag.strip() for tag in tags.split(",") if tag.strip())
+                elif isinstance(tags, Iterable):
+                    collected.update(str(tag) for tag in tags)
+            self._tags = tuple(sorted(collected))
+        return list(self._tags)
 
     @property
     def cwd(self) -> Optional[str]:
-        for event in reversed(self.events):
-            cwd = event.metadata.get("cwd")
-            if cwd:
-                return str(cwd)
-        return None
+        if self._cwd is _UNSET:
+            found: Optional[str] = None
+            for event in reversed(self.events):
+                cwd = event.metadata.get("cwd")
+                if cwd:
+                    found = str(cwd)
+                    break
+            self._cwd = found
+        return self._cwd
 
     @property
     def title(self) -> str:
-        for event in self.events:
-            if event.content:
-                snippet = event.content.strip().splitlines()[0]
-                return snippet[:80]
-        return f"Step {self.step}"
-
-
-def _load_json_lines(path: Path) -> list[dict]:
-    records: list[dict] = []
-    with path.open("r", encoding="utf-8") as handle:
-        for index, line in enumerate(handle, start=1):
-            line = line.strip()
-            if not line:
+        if self._title is _UNSET:
+            title = f"Step {self.step}"
+            for event in self.events:
+                content = event.content
+                if content:
+                    title = content.strip().splitlines()[0][:80]
+                    break
+            self._title = title
+        return self._title
+
+
+# ``events.jsonl`` files smaller than this are parsed in-process even when workers are allowed.
+_PARALLEL_MIN_BYTES = 8 << 20
+_CHUNKS_PER_WORKER = 4
+
+
+def _split_lines(view: mmap.mmap, start: int, end: int) -> Iterator[tuple[int, int, bytes | None]]:
+    """Yield ``(line_number, offset, line)`` for ``view[start:end]``, numbered from 1.
+
+    Blank lines are yielded as ``None`` so callers can keep counting them.
+    """
+
+    view.seek(start)
+    readline = view.readline
+    number = 0
+    position = start
+    while position < end:
+        line = readline()
+        offset = position
+        position += len(line)
+        number += 1
+        line = line.rstrip(b"\r\n")
+        yield number, offset, (None if not line or line.isspace() else line)
+
+
+def _chunk_bounds(view: mmap.mmap, size: int, chunks: int) -> list[tuple[int, int]]:
+    step = max(1, size // chunks)
+    bounds: list[tuple[int, int]] = []
+    start = 0
+    while start < size:
+        newline = view.find(b"\n", start + step) if start + step < size else -1
+        end = size if newline == -1 else newline + 1
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _parse_jsonl_chunk(job: tuple[str, int, int, str, bool]) -> tuple[int, list[tuple[int, Any]]]:
+    """Parse one newline-aligned byte range; line numbers are relative to the chunk."""
+
+    path, start, end, backend, lazy = job
+    loads = get_backend(backend).loads
+    parsed: list[tuple[int, Any]] = []
+    lines = 0
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        for lines, offset, line in _split_lines(view, start, end):
+            if line is not None:
+                record = loads(line)
+                if lazy:
+                    _defer_content(record, ContentRef(path, offset, len(line)))
+                parsed.append((lines, record))
+    return lines, parsed
+
+
+def _iter_json_lines_parallel(
+    path: Path, size: int, workers: int, lazy: bool = False
+) -> Iterator[dict]:
+    with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        bounds = _chunk_bounds(view, size, workers * _CHUNKS_PER_WORKER)
+    backend = active_backend().name
+    location = str(path.absolute())
+    offset = 0
+
+    def drain(future: Future[tuple[int, list[tuple[int, Any]]]]) -> Iterator[dict]:
+        nonlocal offset
+        lines, parsed = future.result()
+        for number, record in parsed:
+            record.setdefault("__source", path.name)
+            record.setdefault("__index", offset + number)
+            yield record
+        offset += lines
+
+    # Like ``_iter_json_files``, only a bounded window of chunks is in flight so
+    # parsed records never pile up ahead of the consumer.
+    with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as executor:
+        window: deque[Future[tuple[int, list[tuple[int, Any]]]]] = deque()
+        for start, end in bounds:
+            job = (location, start, end, backend, lazy)
+            window.append(executor.submit(_parse_jsonl_chunk, job))
+            if len(window) >= workers * 2:
+                yield from drain(window.popleft())
+        while window:
+            yield from drain(window.popleft())
+
+
+def _iter_json_lines(path: Path, workers: int = 1, lazy: bool = False) -> Iterator[dict]:
+    """Yield records from a JSONL file, splitting lines on the memory-mapped bytes.
+
+    Files of at least ``_PARALLEL_MIN_BYTES`` are split into newline-aligned
+    chunks and parsed by ``workers`` processes; records still come back in
+    file order with the same ``__index`` line numbers. With ``lazy``, long
+    content is replaced by a ``__content_ref`` to the line's byte span.
+    """
+
+    size = path.stat().st_size
+    if size == 0:
+        return
+    if workers > 1 and size >= _PARALLEL_MIN_BYTES:
+        yield from _iter_json_lines_parallel(path, size, workers, lazy)
+        return
+
+    loads = active_backend().loads
+    location = str(path.absolute())
+    with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        for index, offset, line in _split_lines(view, 0, size):
+            if line is None:
                 continue
-            record = json.loads(line)
+            record = loads(line)
+            if lazy:
+                _defer_content(record, ContentRef(location, offset, len(line)))
             record.setdefault("__source", path.name)
             record.setdefault("__index", index)
-            records.append(record)
-    return records
+            yield record
 
 
-def _load_json_file(path: Path) -> list[dict]:
-    data = json.loads(path.read_text(encoding="utf-8"))
+def _load_json_file(path: Path, backend: Optional[str] = None, lazy: bool = False) -> list[dict]:
+    loads = get_backend(backend).loads if backend else active_backend().loads
+    data = loads(path.read_bytes())
+    # Containers (lists, ``{"events": [...]}``) stay eager: their items have no
+    # byte span of their own, so re-reading one would decode the whole file.
     if isinstance(data, list):
         records: list[dict] = []
         for index, item in enumerate(data, start=1):
@@ -107,11 +339,63 @@ def _load_json_file(path: Path) -> list[dict]:
     if isinstance(data, dict):
         data.setdefault("__source", path.name)
         data.setdefault("__index", 1)
+        if lazy:
+            _defer_content(data, ContentRef(str(path.absolute()), 0, -1))
         return [data]
     raise GroupingError(f"{path} is not a recognised events container")
 
 
-def _find_event_sources(raw_root: Path) -> list[Path]:
+# Directories with fewer files than this are read sequentially.
+_PARALLEL_MIN_FILES = 64
+_DIRECTORY_THREADS = 16
+_FILES_PER_JOB = 32
+
+
+def _load_json_files(
+    paths: list[Path], backend: Optional[str] = None, lazy: bool = False
+) -> list[list[dict]]:
+    return [_load_json_file(path, backend, lazy) for path in paths]
+
+
+def _iter_json_files(paths: list[Path], workers: int = 1, lazy: bool = False) -> Iterator[dict]:
+    """Yield records from many small JSON files in ``paths`` order.
+
+    Large directories are read by a thread pool so per-file open/read latency
+    overlaps; with ``workers`` above 1 the files are read and parsed by that
+    many processes instead. Only a bounded window of jobs is in flight, so
+    records are still produced incrementally.
+    """
+
+    if len(paths) < _PARALLEL_MIN_FILES:
+        for path in paths:
+            yield from _load_json_file(path, lazy=lazy)
+        return
+
+    executor: Executor
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        slots = workers
+    else:
+        executor = ThreadPoolExecutor(max_workers=_DIRECTORY_THREADS)
+        slots = _DIRECTORY_THREADS
+    backend = active_backend().name
+    jobs = (paths[start : start + _FILES_PER_JOB] for start in range(0, len(paths), _FILES_PER_JOB))
+
+    with executor:
+        window: deque[Future[list[list[dict]]]] = deque()
+        for job in jobs:
+            window.append(executor.submit(_load_json_files, job, backend, lazy))
+            if len(window) >= slots * 2:
+                for records in window.popleft().result():
+                    yield from records
+        while window:
+            for records in window.popleft().result():
+                yield from records
+
+
+def find_event_sources(raw_root: Path) -> list[Path]:
+    """Return the files the loaders read from ``raw_root``, in load order."""
+
     candidates: list[Path] = []
     jsonl = raw_root / "events.jsonl"
     if jsonl.exists():
@@ -226,9 +510,8 @@ def _normalise_event(raw: dict, fallback_step: str) -> Event:
 
     role = raw.get("role") or author_role or raw.get("type") or "unknown"
 
-    content = (
-        raw.get("content") or raw.get("message") or raw.get("text") or raw.get("summary") or ""
-    )
+    content_ref = raw.get("__content_ref")
+    content = "" if content_ref is not None else _select_content(raw)
 
     timestamp = _parse_timestamp(
         raw.get("ts") or raw.get("timestamp") or metadata.get("ts") or metadata.get("timestamp")
@@ -248,47 +531,231 @@ def _normalise_event(raw: dict, fallback_step: str) -> Event:
     if step_candidate is None:
         metadata.setdefault("fallback_step", fallback_step)
 
+    if content_ref is not None:
+        return LazyEvent(
+            step=str(step),
+            role=str(role),
+            content_ref=content_ref,
+            timestamp=timestamp,
+            status=status if status else None,
+            metadata=metadata,
+        )
     return Event(
         step=str(step),
         role=str(role),
-        content=str(content),
+        content=content,
         timestamp=timestamp,
         status=status if status else None,
         metadata=metadata,
     )
 
 
-def load_event_groups(raw_root: Path) -> list[EventGroup]:
-    """Load session events grouped by step for downstream distillation."""
+def _iter_raw_events(raw_root: Path, workers: int = 1, lazy: bool = False) -> Iterator[dict]:
+    sources = find_event_sources(raw_root)
+    for is_jsonl, run in groupby(sources, key=lambda source: source.suffix == ".jsonl"):
+        if is_jsonl:
+            for source in run:
+                yield from _iter_json_lines(source, workers, lazy)
+        else:
+            yield from _iter_json_files(list(run), workers, lazy)
+
+
+def _build_group(step: str, events: list[Event]) -> EventGroup:
+    ordered = sorted(events, key=lambda e: e.timestamp)
+    return EventGroup(
+        step=step,
+        events=ordered,
+        started_at=ordered[0].timestamp,
+        completed_at=ordered[-1].timestamp,
+    )
+
+
+def iter_events(raw_root: Path, *, workers: int = 1, lazy: bool = False) -> Iterator[Event]:
+    """Yield normalised events one at a time in source order.
+
+    ``workers`` above 1 lets large ``events.jsonl`` files and ``events/``
+    directories be parsed in parallel processes. With ``lazy``, events whose
+    content is at least ``_LAZY_MIN_CHARS`` long are yielded as
+    :class:`LazyEvent` and keep only a reference to it.
+    """
 
     raw_root = Path(raw_root)
-    sources = _find_event_sources(raw_root)
-    raw_events: list[dict] = []
-    for source in sources:
-        if source.suffix == ".jsonl":
-            raw_events.extend(_load_json_lines(source))
-        else:
-            raw_events.extend(_load_json_file(source))
+    index = 0
+    for index, raw in enumerate(_iter_raw_events(raw_root, workers, lazy), start=1):
+        yield _normalise_event(raw, f"{index:03d}")
 
-    if not raw_events:
+    if index == 0:
         raise GroupingError(f"no events parsed from {raw_root}")
 
-    groups: dict[str, list[Event]] = defaultdict(list)
-    for index, raw in enumerate(raw_events, start=1):
-        fallback_step = f"{index:03d}"
-        event = _normalise_event(raw, fallback_step)
-        groups[event.step].append(event)
 
-    ordered_steps = sorted(groups.keys(), key=lambda step: min(e.timestamp for e in groups[step]))
-    return [
-        EventGroup(step=step, events=sorted(groups[step], key=lambda e: e.timestamp))
-        for step in ordered_steps
-    ]
+def group_consecutive(events: Iterable[Event]) -> Iterator[EventGroup]:
+    """Group runs of consecutive events that share a step, in input order."""
+
+    current_step: str | None = None
+    pending: list[Event] = []
+    for event in events:
+        if pending and event.step != current_step:
+            yield _build_group(current_step, pending)
+            pending = []
+        current_step = event.step
+        pending.append(event)
+
+    if pending:
+        yield _build_group(current_step, pending)
+
+
+def group_events(events: Iterable[Event]) -> list[EventGroup]:
+    """Group events by step, ordering steps by their earliest event."""
+
+    groups: dict[str, list[Event]] = {}
+    earliest: dict[str, datetime] = {}
+    for event in events:
+        bucket = groups.get(event.step)
+        if bucket is None:
+            groups[event.step] = [event]
+            earliest[event.step] = event.timestamp
+            continue
+        bucket.append(event)
+        if event.timestamp < earliest[event.step]:
+            earliest[event.step] = event.timestamp
+
+    ordered_steps = sorted(groups, key=earliest.__getitem__)
+    return [_build_group(step, groups[step]) for step in ordered_steps]
+
+
+def iter_event_groups(
+    raw_root: Path, *, workers: int = 1, lazy: bool = False
+) -> Iterator[EventGroup]:
+    """Stream groups of consecutive events that share a step.
+
+    Only the group currently being built is held in memory. Unlike
+    :func:`load_event_groups`, steps are emitted in source order, so a step
+    that reappears after another step produces a second group.
+    """
+
+    return group_consecutive(iter_events(raw_root, workers=workers, lazy=lazy))
+
+
+def load_event_groups(raw_root: Path, *, workers: int = 1, lazy: bool = False) -> list[EventGroup]:
+    """Load session events grouped by step for downstream distillation."""
+
+    return group_events(iter_events(raw_root, workers=workers, lazy=lazy))
+
+
+_TAIL_BYTES = 256
+
+
+def _tail_digest(path: Path, offset: int) -> str:
+    start = max(0, offset - _TAIL_BYTES)
+    with path.open("rb") as handle:
+        handle.seek(start)
+        return hashlib.sha256(handle.read(offset - start)).hexdigest()
+
+
+def _iter_appended_lines(path: Path, checkpoint: SourceCheckpoint) -> Iterator[dict]:
+    loads = active_backend().loads
+    with path.open("rb") as handle:
+        handle.seek(checkpoint.offset)
+        if checkpoint.open_line:
+            if handle.read(1) != b"\n":
+                raise StaleCheckpointError(f"{checkpoint.name} rewrote its last line")
+            checkpoint.offset += 1
+            checkpoint.open_line = False
+
+        for raw_line in handle:
+            terminated = raw_line.endswith(b"\n")
+            line = raw_line.strip()
+            if line:
+                try:
+                    record = loads(line)
+                except ValueError:
+                    if terminated:
+                        raise
+                    # A writer is still appending this line; pick it up next time.
+                    break
+                record.setdefault("__source", path.name)
+                record.setdefault("__index", checkpoint.last_index + 1)
+            else:
+                record = None
+            checkpoint.last_index += 1
+            checkpoint.offset += len(raw_line)
+            checkpoint.open_line = not terminated
+            if record is not None:
+                yield record
+
+    checkpoint.tail = _tail_digest(path, checkpoint.offset)
+
+
+def iter_appended_events(
+    raw_root: Path,
+    checkpoints: dict[str, SourceCheckpoint],
+    *,
+    start_index: int = 0,
+) -> Iterator[Event]:
+    """Yield events added to ``raw_root`` since ``checkpoints`` were recorded.
+
+    Appended ``events.jsonl`` lines are read from the recorded byte offset and
+    new ``events/*.json`` files are loaded whole; ``checkpoints`` is advanced in
+    place as records are consumed. ``start_index`` is the number of records
+    already seen, so fallback step numbering continues where it left off.
+    Raises :class:`StaleCheckpointError` before yielding anything when a
+    recorded source was removed, truncated or rewritten.
+    """
+
+    raw_root = Path(raw_root)
+    sources = find_event_sources(raw_root)
+    names = {source.relative_to(raw_root).as_posix(): source for source in sources}
+
+    removed = sorted(set(checkpoints) - set(names))
+    if removed:
+        raise StaleCheckpointError(f"event sources removed: {', '.join(removed)}")
+
+    pending: list[tuple[Path, SourceCheckpoint]] = []
+    for name, source in names.items():
+        stat = source.stat()
+        previous = checkpoints.get(name)
+        if previous is not None:
+            if previous.size == stat.st_size and previous.mtime_ns == stat.st_mtime_ns:
+                continue
+            if source.suffix != ".jsonl":
+                raise StaleCheckpointError(f"{name} was rewritten")
+            if stat.st_size < previous.offset or (
+                _tail_digest(source, previous.offset) != previous.tail
+            ):
+                raise StaleCheckpointError(f"{name} was truncated or rewritten")
+            previous.size, previous.mtime_ns = stat.st_size, stat.st_mtime_ns
+            pending.append((source, previous))
+        else:
+            checkpoint = SourceCheckpoint(name=name, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            checkpoints[name] = checkpoint
+            pending.append((source, checkpoint))
+
+    index = start_index
+    for source, checkpoint in pending:
+        if source.suffix == ".jsonl":
+            records: Iterable[dict] = _iter_appended_lines(source, checkpoint)
+        else:
+            records = _load_json_file(source)
+            checkpoint.last_index = len(records)
+            checkpoint.offset = checkpoint.size
+        for raw in records:
+            index += 1
+            yield _normalise_event(raw, f"{index:03d}")
 
 
 __all__ = [
+    "ContentRef",
     "Event",
     "EventGroup",
     "GroupingError",
+    "LazyEvent",
+    "SourceCheckpoint",
+    "StaleCheckpointError",
+    "find_event_sources",
+    "group_consecutive",
+    "group_events",
+    "iter_appended_events",
+    "iter_event_groups",
+    "iter_events",
     "load_event_groups",
 ]
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+class JSONBackendError(RuntimeError):
+    """Raised when a requested JSON backend is unknown or not installed."""
+
+
+@dataclass(frozen=True, slots=True)
+class JSONBackend:
+    """A JSON decoder accepting ``bytes`` or ``str`` and raising ``ValueError`` on bad input."""
+
+    name: str
+    loads: Callable[[bytes | str], Any]
+
+
+# The fast decoders reject ``NaN``/``Infinity``, which ``json.dumps`` writes by
+# default; input they refuse is retried with the stdlib so every backend
+# accepts the same documents.
+
+
+def _orjson() -> JSONBackend:
+    import orjson
+
+    decode = orjson.loads
+
+    def loads(data: bytes | str) -> Any:
+        try:
+            return decode(data)
+        except ValueError:  # orjson.JSONDecodeError subclasses ValueError
+            return json.loads(data)
+
+    return JSONBackend("orjson", loads)
+
+
+def _msgspec() -> JSONBackend:
+    import msgspec
+
+    decode = msgspec.json.decode
+    decode_error = msgspec.DecodeError
+
+    def loads(data: bytes | str) -> Any:
+        try:
+            return decode(data)
+        except decode_error:
+            return json.loads(data)
+
+    return JSONBackend("msgspec", loads)
+
+
+def _stdlib() -> JSONBackend:
+    return JSONBackend("json", json.loads)
+
+
+_FACTORIES: dict[str, Callable[[], JSONBackend]] = {
+    "orjson": _orjson,
+    "msgspec": _msgspec,
+    "json": _stdlib,
+}
+
+
+def available_backends() -> list[str]:
+    """Return the installed backends, fastest first."""
+
+    names = []
+    for name in BACKENDS:
+        try:
+            _FACTORIES[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend(name: Optional[str] = None) -> JSONBackend:
+    """Return the backend called ``name``: the stdlib for ``None``, the fastest for ``"auto"``."""
+
+    if name is None:
+        return _stdlib()
+    if name == "auto":
+        for candidate in BACKENDS:
+            try:
+                return _FACTORIES[candidate]()
+            except ImportError:
+                continue
+    if name not in _FACTORIES:
+        raise JSONBackendError(f"unknown JSON backend '{name}' (expected one of {BACKENDS})")
+    try:
+        return _FACTORIES[name]()
+    except ImportError as exc:
+        raise JSONBackendError(f"JSON backend '{name}' is not installed") from exc
+
+
+_active: Optional[JSONBackend] = None
+
+
+def active_backend() -> JSONBackend:
+    """Return the process-wide decoder, honouring ``OH2WEBUI_JSON_BACKEND`` on first use.
+
+    Without the variable the stdlib decoder is used.
+    """
+
+    global _active
+    if _active is None:
+        _active = get_backend(os.getenv("OH2WEBUI_JSON_BACKEND", "").strip().lower() or None)
+    return _active
+
+
+def set_backend(name: Optional[str]) -> JSONBackend:
+    """Switch the process-wide decoder; ``None`` re-selects from the environment."""
+
+    global _active
+    _active = None if name is None else get_backend(name)
+    return active_backend()
+
+
+def loads(data: bytes | str) -> Any:
+    return active_backend().loads(data)
+
+
+__all__ = [
+    "BACKENDS",
+    "JSONBackend",
+    "JSONBackendError",
+    "active_backend",
+    "available_backends",
+    "get_backend",
+    "loads",
+    "set_backend",
+]
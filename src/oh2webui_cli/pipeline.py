@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from .chatter import create_chat
+from .config import Settings
+from .distiller import distill_session
+from .extractor import extract_session
+from .packager import package_artifacts
+from .uploader import UploadError, upload_artifacts
+
+
+class PipelineError(RuntimeError):
+    """Raised when a pipeline run cannot be scheduled."""
+
+
+@dataclass(slots=True)
+class PipelineOutcome:
+    session_id: str
+    raw_dir: Path
+    artifacts_dir: Path
+    stage: str
+    durations: dict[str, float] = field(default_factory=dict)
+    collection_id: str | None = None
+    chat_id: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(slots=True)
+class _LocalJob:
+    session_id: str
+    source_root: Path
+    raw_dir: Path
+    artifacts_dir: Path
+    settings: Settings
+    overwrite: bool
+    sync: bool
+    extract_mode: str
+    selective: bool
+    incremental: bool
+    per_step: bool
+    package: bool
+
+
+def _run_local_stages(job: _LocalJob) -> PipelineOutcome:
+    """Extract, distill and optionally package one session (CPU/disk-bound stages)."""
+
+    outcome = PipelineOutcome(
+        session_id=job.session_id,
+        raw_dir=job.raw_dir,
+        artifacts_dir=job.artifacts_dir,
+        stage="extract",
+    )
+    try:
+        started = time.perf_counter()
+        extract_session(
+            job.session_id,
+            job.source_root,
+            job.raw_dir,
+            overwrite=job.overwrite,
+            sync=job.sync,
+            mode=job.extract_mode,
+            selective=job.selective,
+        )
+        outcome.durations["extract"] = time.perf_counter() - started
+
+        outcome.stage = "distill"
+        started = time.perf_counter()
+        distill_session(
+            session_id=job.session_id,
+            raw_root=job.raw_dir,
+            artifacts_root=job.artifacts_dir,
+            settings=job.settings,
+            incremental=job.incremental,
+            per_step=job.per_step,
+        )
+        outcome.durations["distill"] = time.perf_counter() - started
+
+        if job.package:
+            outcome.stage = "package"
+            started = time.perf_counter()
+            package_artifacts(job.artifacts_dir)
+            outcome.durations["package"] = time.perf_counter() - started
+    except Exception as exc:  # reported per session rather than aborting the run
+        outcome.error = f"{type(exc).__name__}: {exc}"
+    return outcome
+
+
+def _run_network_stages(
+    outcome: PipelineOutcome, settings: Settings, variant: str, status: str
+) -> PipelineOutcome:
+    """Upload artifacts and seed the chat for one session (network-bound stages)."""
+
+    try:
+        outcome.stage = "upload"
+        started = time.perf_counter()
+        upload = upload_artifacts(
+            session_id=outcome.session_id,
+            artifacts_dir=outcome.artifacts_dir,
+            settings=settings,
+            variant=variant,
+        )
+        outcome.collection_id = upload.collection_id
+        outcome.durations["upload"] = time.perf_counter() - started
+        if upload.failed_attachments:
+            raise UploadError(
+                f"{len(upload.failed_attachments)} artifact(s) failed to attach: "
+                + ", ".join(upload.failed_attachments)
+            )
+
+        outcome.stage = "chat"
+        started = time.perf_counter()
+        chat = create_chat(
+            session_id=outcome.session_id,
+            artifacts_dir=outcome.artifacts_dir,
+            collection_id=upload.collection_id,
+            collection_name=upload.collection_name,
+            variant=variant,
+            settings=settings,
+            status=status,
+        )
+        outcome.chat_id = chat.chat_id
+        outcome.durations["chat"] = time.perf_counter() - started
+        outcome.stage = "done"
+    except Exception as exc:  # reported per session rather than aborting the run
+        outcome.error = f"{type(exc).__name__}: {exc}"
+    return outcome
+
+
+def run_pipeline(
+    session_ids: Iterable[str],
+    *,
+    sessions_root: Path,
+    work_root: Path,
+    settings: Settings,
+    variant: str = "3A",
+    status: str = "complete",
+    cpu_workers: int | None = None,
+    net_workers: int = 4,
+    overwrite: bool = False,
+    sync: bool = False,
+    extract_mode: str = "copy",
+    selective: bool = False,
+    incremental: bool = False,
+    per_step: bool = False,
+    package: bool = False,
+) -> list[PipelineOutcome]:
+    """Run extract → distill → (package) → upload → chat for many sessions.
+
+    Local stages run in a process pool of ``cpu_workers`` and hand each
+    finished session straight to a thread pool of ``net_workers`` for the
+    network stages, so one session can upload while others are still being
+    distilled. Each session is laid out as ``work_root/<id>/raw`` and
+    ``work_root/<id>/artifacts``; outcomes are returned in request order.
+    """
+
+    if variant not in {"3A", "3B"}:
+        raise PipelineError("chat variant must be 3A or 3B")
+    if cpu_workers is None:
+        cpu_workers = os.cpu_count() or 1
+    if cpu_workers < 1 or net_workers < 1:
+        raise PipelineError("worker counts must be at least 1")
+
+    sessions_root = Path(sessions_root).expanduser()
+    work_root = Path(work_root).expanduser()
+    jobs = [
+        _LocalJob(
+            session_id=session_id,
+            source_root=sessions_root,
+            raw_dir=work_root / session_id / "raw",
+            artifacts_dir=work_root / session_id / "artifacts",
+            settings=settings,
+            overwrite=overwrite,
+            sync=sync,
+            extract_mode=extract_mode,
+            selective=selective,
+            incremental=incremental,
+            per_step=per_step,
+            package=package,
+        )
+        for session_id in dict.fromkeys(session_ids)
+    ]
+    if not jobs:
+        return []
+
+    outcomes: dict[str, PipelineOutcome] = {}
+    with (
+        ProcessPoolExecutor(max_workers=min(cpu_workers, len(jobs))) as local_pool,
+        ThreadPoolExecutor(max_workers=min(net_workers, len(jobs))) as network_pool,
+    ):
+        local_futures = [local_pool.submit(_run_local_stages, job) for job in jobs]
+        network_futures: list[Future[PipelineOutcome]] = []
+        for future in as_completed(local_futures):
+            outcome = future.result()
+            outcomes[outcome.session_id] = outcome
+            if outcome.ok:
+                network_futures.append(
+                    network_pool.submit(_run_network_stages, outcome, settings, variant, status)
+                )
+        for future in network_futures:
+            outcome = future.result()
+            outcomes[outcome.session_id] = outcome
+
+    return [outcomes[job.session_id] for job in jobs]
+
+
+__all__ = ["PipelineError", "PipelineOutcome", "run_pipeline"]
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
 import json
+import random
+import threading
 import time
 import uuid
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 import httpx
 
 from .config import Settings
 from .distiller import ArtifactRecord
+from .endpoints import EndpointCache
 
 
 class UploadError(RuntimeError):
@@ -26,6 +30,217 @@ class UploadResult:
     file_ids: list[str]
     variant: str
     dry_run: bool
+    failed_attachments: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class AttachOutcome:
+    file_id: str
+    attached: bool
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class ChatDocument:
+    """Local copy of a chat document, so updates are built without refetching it."""
+
+    chat: Dict[str, Any]
+    user_msg_id: str
+    assistant_msg_id: str | None = None
+
+    @classmethod
+    def build(
+        cls,
+        *,
+        title: str,
+        model: str,
+        variant: str,
+        prefill: str,
+        collection_id: str,
+        collection_name: str | None,
+    ) -> "ChatDocument":
+        """Build a new chat with the collection already linked to the chat and first turn."""
+
+        user_msg_id = uuid.uuid4().hex
+        timestamp = int(time.time())
+        knowledge_entry = {"id": collection_id, "type": "collection"}
+        if collection_name:
+            knowledge_entry["name"] = collection_name
+        chat: Dict[str, Any] = {
+            "title": title,
+            "metadata": {
+                "collection_id": collection_id,
+                "variant": variant,
+            },
+            "models": [model],
+            "messages": [
+                {
+                    "id": user_msg_id,
+                    "role": "user",
+                    "content": prefill,
+                    "timestamp": timestamp,
+                    "models": [model],
+                    "parentId": None,
+                    "childrenIds": [],
+                    "files": [knowledge_entry],
+                    "metadata": {"collection_id": collection_id},
+                }
+            ],
+            "knowledge_ids": [collection_id],
+            "files": [knowledge_entry],
+            "history": {
+                "current_id": user_msg_id,
+                "currentId": user_msg_id,
+                "messages": {
+                    user_msg_id: {
+                        "id": user_msg_id,
+                        "role": "user",
+                        "content": prefill,
+                        "timestamp": timestamp,
+                        "models": [model],
+                        "parentId": None,
+                        "childrenIds": [],
+                        "files": [knowledge_entry],
+                    }
+                },
+            },
+            "currentId": user_msg_id,
+        }
+
+        if collection_name:
+            chat["metadata"]["collection_name"] = collection_name
+            chat["messages"][0]["metadata"]["collection_name"] = collection_name
+
+        return cls(chat=chat, user_msg_id=user_msg_id)
+
+    def payload(self) -> Dict[str, Any]:
+        return {"chat": self.chat}
+
+    def add_assistant_placeholder(self, model: str) -> str:
+        assistant_msg_id = uuid.uuid4().hex
+        timestamp = int(time.time())
+        user_msg_id = self.user_msg_id
+
+        messages = self.chat.setdefault("messages", [])
+        messages.append(
+            {
+                "id": assistant_msg_id,
+                "role": "assistant",
+                "content": "",
+                "parentId": user_msg_id,
+                "modelName": model,
+                "modelIdx": 0,
+                "timestamp": timestamp,
+                "done": False,
+                "statusHistory": [],
+                "childrenIds": [],
+            }
+        )
+
+        for message in messages:
+            if isinstance(message, dict) and message.get("id") == user_msg_id:
+                children = message.setdefault("childrenIds", [])
+                if assistant_msg_id not in children:
+                    children.append(assistant_msg_id)
+                break
+
+        history = self.chat.setdefault("history", {})
+        history_messages = history.setdefault("messages", {})
+        history_messages[assistant_msg_id] = {
+            "id": assistant_msg_id,
+            "role": "assistant",
+            "content": "",
+            "timestamp": timestamp,
+            "parentId": user_msg_id,
+            "model": model,
+            "modelName": model,
+            "modelIdx": 0,
+            "childrenIds": [],
+            "statusHistory": [],
+            "done": False,
+        }
+        parent_entry = history_messages.get(user_msg_id)
+        if isinstance(parent_entry, dict):
+            children = parent_entry.setdefault("childrenIds", [])
+            if assistant_msg_id not in children:
+                children.append(assistant_msg_id)
+
+        history["current_id"] = assistant_msg_id
+        history["currentId"] = assistant_msg_id
+        self.chat["currentId"] = assistant_msg_id
+        self.assistant_msg_id = assistant_msg_id
+        return assistant_msg_id
+
+    def conversation(self, fallback: str) -> List[Dict[str, str]]:
+        conversation: List[Dict[str, str]] = []
+        for message in self.chat.get("messages", []) or []:
+            if not isinstance(message, dict):
+                continue
+            role = message.get("role")
+            content = message.get("content")
+            if role not in {"user", "assistant"}:
+                continue
+            if role == "assistant" and not content:
+                continue
+            if content is None:
+                continue
+            conversation.append({"role": role, "content": content})
+        if not conversation:
+            conversation.append({"role": "user", "content": fallback})
+        return conversation
+
+    def set_assistant_reply(self, assistant_msg_id: str, text: str, model: str) -> None:
+        messages = self.chat.setdefault("messages", [])
+        found = False
+        for message in messages:
+            if isinstance(message, dict) and message.get("id") == assistant_msg_id:
+                message["content"] = text
+                message["done"] = True
+                message.setdefault("statusHistory", [])
+                found = True
+                break
+        if not found:
+            messages.append(
+                {
+                    "id": assistant_msg_id,
+                    "role": "assistant",
+                    "content": text,
+                    "done": True,
+                    "statusHistory": [],
+                    "timestamp": int(time.time()),
+                    "parentId": None,
+                }
+            )
+
+        history = self.chat.setdefault("history", {})
+        history_messages = history.setdefault("messages", {})
+        assistant_entry = history_messages.get(assistant_msg_id)
+        if isinstance(assistant_entry, dict):
+            assistant_entry["content"] = text
+            assistant_entry["done"] = True
+            assistant_entry.setdefault("statusHistory", [])
+            assistant_entry["model"] = model
+        else:
+            history_messages[assistant_msg_id] = {
+                "id": assistant_msg_id,
+                "role": "assistant",
+                "content": text,
+                "done": True,
+                "statusHistory": [],
+                "model": model,
+                "modelName": model,
+                "timestamp": int(time.time()),
+            }
+
+        history["current_id"] = assistant_msg_id
+        history["currentId"] = assistant_msg_id
+        self.chat["currentId"] = assistant_msg_id
+
+
+# Server versions probed by earlier clients in this process, keyed by base URL, so
+# each new client does not pay another ``GET /api/version``. Failed probes are not kept.
+_SERVER_VERSIONS: dict[str, str] = {}
+_SERVER_VERSIONS_LOCK = threading.Lock()
 
 
 class OpenWebUIClient:
@@ -34,6 +249,8 @@ class OpenWebUIClient:
         self.dry_run = settings.dry_run
         self.base_url = settings.base_url
         self._client: httpx.Client | None = None
+        self._routes: EndpointCache | None = None
+        self._routes_lock = threading.Lock()
         if not self.dry_run:
             if not self.base_url:
                 raise UploadError("OPENWEBUI_BASE_URL is required when not in dry-run mode")
@@ -45,16 +262,57 @@ class OpenWebUIClient:
         if self._client is not None:
             self._client.close()
 
+    def _probe_server_version(self) -> str | None:
+        assert self._client is not None and self.base_url is not None
+        with _SERVER_VERSIONS_LOCK:
+            known = _SERVER_VERSIONS.get(self.base_url)
+        if known is not None:
+            return known
+        try:
+            response = self._client.get("/api/version")
+            response.raise_for_status()
+            payload = response.json()
+        except (httpx.HTTPError, ValueError):
+            return None
+        if not isinstance(payload, dict) or not payload.get("version"):
+            return None
+        version = str(payload["version"])
+        with _SERVER_VERSIONS_LOCK:
+            _SERVER_VERSIONS[self.base_url] = version
+        return version
+
+    def _endpoints(self) -> EndpointCache:
+        """Return the route cache for this server, probing its version on first use.
+
+        Without a persistent cache the routes only live for this client, so the
+        version probe is skipped. When the probe fails the routes are not
+        persisted either, so fallbacks learned during an outage are never
+        shared with other servers whose probe also failed.
+        """
+
+        with self._routes_lock:
+            if self._routes is None:
+                assert self.base_url is not None
+                version = None
+                if self.settings.endpoint_cache is not None:
+                    version = self._probe_server_version()
+                self._routes = EndpointCache(
+                    base_url=self.base_url,
+                    version=version or "unknown",
+                    path=self.settings.endpoint_cache if version else None,
+                    ttl=self.settings.endpoint_cache_ttl,
+                )
+            return self._routes
+
     def upload_markdown(self, file_path: Path) -> str:
         if self.dry_run:
             return f"dry-file-{uuid.uuid4().hex[:8]}"
 
         assert self._client is not None
-        endpoints = [
-            "/api/v1/files/",
-            "/api/v1/files",
-            "/api/v1/files/upload",
-        ]
+        endpoints = self._endpoints().order(
+            "upload",
+            ["/api/v1/files/", "/api/v1/files", "/api/v1/files/upload"],
+        )
         params = {"process": "true", "process_in_background": "false"}
         last_error: httpx.HTTPError | None = None
 
@@ -93,31 +351,57 @@ class OpenWebUIClient:
                     file_id = data.get("id") or data.get("file_id")
                 if not file_id:
                     raise UploadError("upload response missing file id")
+                self._endpoints().remember("upload", endpoint)
                 return str(file_id)
 
         raise UploadError("upload failed; no compatible endpoint found") from last_error
 
-    def poll_file(self, file_id: str, *, retries: int = 40, delay: float = 2.5) -> str:
-        if self.dry_run:
-            return "processed"
-
+    def _get_file_status(self, file_id: str) -> Any:
         assert self._client is not None
-        last_status = None
-        for _ in range(retries):
-            payload = None
+        endpoints = self._endpoints().order(
+            "file_status",
+            ["/api/v1/files/{file_id}/process/status", "/api/v1/files/{file_id}"],
+        )
+        for endpoint in endpoints:
             try:
-                response = self._client.get(f"/api/v1/files/{file_id}/process/status")
+                response = self._client.get(endpoint.format(file_id=file_id))
                 response.raise_for_status()
-                payload = response.json()
             except httpx.HTTPStatusError as exc:
-                if exc.response.status_code in {404, 405}:
-                    response = self._client.get(f"/api/v1/files/{file_id}")
-                    response.raise_for_status()
-                    payload = response.json()
-                else:
-                    raise UploadError(
-                        f"file status check failed ({exc.response.status_code})"
-                    ) from exc
+                status = exc.response.status_code
+                if status in {404, 405} and endpoint != endpoints[-1]:
+                    continue
+                raise UploadError(f"file status check failed ({status})") from exc
+            except httpx.HTTPError as exc:  # pragma: no cover - network issues
+                raise UploadError(f"file status request failed: {exc}") from exc
+            else:
+                self._endpoints().remember("file_status", endpoint)
+                return response.json()
+        raise UploadError("file status check failed; no endpoint available")
+
+    def poll_file(
+        self,
+        file_id: str,
+        *,
+        timeout: float | None = None,
+        initial_delay: float = 0.2,
+        max_delay: float = 5.0,
+    ) -> str:
+        """Wait until ``file_id`` is processed, backing off exponentially with jitter.
+
+        Gives up once ``timeout`` seconds (``settings.poll_timeout`` by default)
+        have elapsed rather than after a fixed number of checks.
+        """
+
+        if self.dry_run:
+            return "processed"
+
+        if timeout is None:
+            timeout = self.settings.poll_timeout
+        deadline = time.monotonic() + timeout
+        delay = initial_delay
+        last_status = None
+        while True:
+            payload = self._get_file_status(file_id)
             status = None
             processed_flag = False
             if isinstance(payload, dict):
@@ -136,8 +420,15 @@ class OpenWebUIClient:
             if status == "error":
                 return "error"
             last_status = status or "unknown"
-            time.sleep(delay)
-        raise UploadError(f"file {file_id} did not finish processing (last status={last_status})")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise UploadError(
+                    f"file {file_id} did not finish processing within {timeout:.0f}s "
+                    f"(last status={last_status})"
+                )
+            time.sleep(min(remaining, delay / 2 + random.uniform(0, delay / 2)))
+            delay = min(max_delay, delay * 2)
 
     def create_collection(self, name: str, description: str) -> str:
         if self.dry_run:
@@ -145,7 +436,9 @@ class OpenWebUIClient:
 
         assert self._client is not None
         payload = {"name": name, "description": description}
-        endpoints = ["/api/v1/knowledge/create", "/api/v1/knowledge"]
+        endpoints = self._endpoints().order(
+            "knowledge_create", ["/api/v1/knowledge/create", "/api/v1/knowledge"]
+        )
 
         last_error: httpx.HTTPError | None = None
         for endpoint in endpoints:
@@ -172,10 +465,19 @@ class OpenWebUIClient:
                 )
                 if not collection_id:
                     raise UploadError("knowledge creation response missing id")
+                self._endpoints().remember("knowledge_create", endpoint)
                 return str(collection_id)
 
         raise UploadError("knowledge creation failed; no endpoint available") from last_error
 
+    def delete_collection(self, collection_id: str) -> None:
+        if self.dry_run:
+            return
+
+        assert self._client is not None
+        response = self._client.delete(f"/api/v1/knowledge/{collection_id}/delete")
+        response.raise_for_status()
+
     def attach_file(self, collection_id: str, file_id: str) -> None:
         if self.dry_run:
             return
@@ -186,6 +488,76 @@ class OpenWebUIClient:
         response = self._client.post(endpoint, json=payload)
         response.raise_for_status()
 
+    def _attach_each(
+        self, collection_id: str, file_ids: list[str], concurrency: int
+    ) -> list[AttachOutcome]:
+        def attach(file_id: str) -> AttachOutcome:
+            try:
+                self.attach_file(collection_id, file_id)
+            except httpx.HTTPStatusError as exc:
+                return AttachOutcome(file_id, False, f"status {exc.response.status_code}")
+            except httpx.HTTPError as exc:
+                return AttachOutcome(file_id, False, str(exc))
+            return AttachOutcome(file_id, True)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(file_ids)))) as pool:
+            return list(pool.map(attach, file_ids))
+
+    def attach_files(
+        self,
+        collection_id: str,
+        file_ids: list[str],
+        *,
+        concurrency: int = 4,
+        batch: bool = True,
+    ) -> list[AttachOutcome]:
+        """Attach ``file_ids`` to a collection, returning one outcome per file.
+
+        Uses the batch endpoint when the server offers it (and ``batch`` is
+        set) and otherwise at most ``concurrency`` parallel single-file
+        attaches. Failed files should be retried with ``batch=False``: a failed
+        batch request marks every file failed, so only single attaches give
+        real per-file outcomes.
+        """
+
+        if self.dry_run or not file_ids:
+            return [AttachOutcome(file_id, True) for file_id in file_ids]
+        if not batch:
+            return self._attach_each(collection_id, file_ids, concurrency)
+
+        assert self._client is not None
+        batch_route = "/api/v1/knowledge/{collection_id}/files/batch/add"
+        single_route = "/api/v1/knowledge/{collection_id}/file/add"
+        routes = self._endpoints().order("knowledge_attach", [batch_route, single_route])
+        if routes[0] == single_route:
+            return self._attach_each(collection_id, file_ids, concurrency)
+
+        try:
+            response = self._client.post(
+                batch_route.format(collection_id=collection_id),
+                json=[{"file_id": file_id} for file_id in file_ids],
+            )
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code in {404, 405}:
+                self._endpoints().remember("knowledge_attach", single_route)
+                return self._attach_each(collection_id, file_ids, concurrency)
+            detail = f"batch attach failed with status {exc.response.status_code}"
+            return [AttachOutcome(file_id, False, detail) for file_id in file_ids]
+        except httpx.HTTPError as exc:
+            return [AttachOutcome(file_id, False, str(exc)) for file_id in file_ids]
+
+        self._endpoints().remember("knowledge_attach", batch_route)
+        payload = response.json() if response.content else {}
+        errors: list[str] = []
+        if isinstance(payload, dict) and isinstance(payload.get("warnings"), dict):
+            errors = [str(item) for item in payload["warnings"].get("errors") or []]
+        outcomes: list[AttachOutcome] = []
+        for file_id in file_ids:
+            failure = next((error for error in errors if file_id in error), None)
+            outcomes.append(AttachOutcome(file_id, failure is None, failure))
+        return outcomes
+
     @staticmethod
     def _extract_first_id(payload: dict | list | str | int | None) -> str | None:
         if isinstance(payload, dict):
@@ -233,14 +605,14 @@ class OpenWebUIClient:
             return None
 
         assert self._client is not None
-        endpoints = [
-            f"/api/v1/knowledge/{collection_id}",
-            f"/api/v1/knowledge/{collection_id}/info",
-        ]
+        endpoints = self._endpoints().order(
+            "knowledge_info",
+            ["/api/v1/knowledge/{collection_id}", "/api/v1/knowledge/{collection_id}/info"],
+        )
 
         for endpoint in endpoints:
             try:
-                response = self._client.get(endpoint)
+                response = self._client.get(endpoint.format(collection_id=collection_id))
                 response.raise_for_status()
             except httpx.HTTPStatusError as exc:
                 status = exc.response.status_code
@@ -252,6 +624,7 @@ class OpenWebUIClient:
             except httpx.HTTPError:
                 continue
 
+            self._endpoints().remember("knowledge_info", endpoint)
             payload = response.json() if response.content else {}
             if isinstance(payload, dict):
                 maybe = OpenWebUIClient._extract_first_name(payload)
@@ -278,59 +651,20 @@ class OpenWebUIClient:
             return f"dry-chat-{uuid.uuid4().hex[:6]}"
 
         assert self._client is not None
-        user_msg_id = uuid.uuid4().hex
-        timestamp = int(time.time())
-        knowledge_entry = {"id": collection_id, "type": "collection"}
-        if collection_name:
-            knowledge_entry["name"] = collection_name
-        payload = {
-            "chat": {
-                "title": title,
-                "metadata": {
-                    "collection_id": collection_id,
-                    "variant": variant,
-                },
-                "models": [self.settings.model],
-                "messages": [
-                    {
-                        "id": user_msg_id,
-                        "role": "user",
-                        "content": prefill,
-                        "timestamp": timestamp,
-                        "models": [self.settings.model],
-                        "parentId": None,
-                        "childrenIds": [],
-                        "files": [knowledge_entry],
-                        "metadata": {"collection_id": collection_id},
-                    }
-                ],
-                "knowledge_ids": [collection_id],
-                "files": [knowledge_entry],
-                "history": {
-                    "current_id": user_msg_id,
-                    "currentId": user_msg_id,
-                    "messages": {
-                        user_msg_id: {
-                            "id": user_msg_id,
-                            "role": "user",
-                            "content": prefill,
-                            "timestamp": timestamp,
-                            "models": [self.settings.model],
-                            "parentId": None,
-                            "childrenIds": [],
-                            "files": [knowledge_entry],
-                        }
-                    },
-                },
-                "currentId": user_msg_id,
-            }
-        }
-
-        if collection_name:
-            payload["chat"]["metadata"]["collection_name"] = collection_name
-            payload["chat"]["messages"][0]["metadata"]["collection_name"] = collection_name
+        document = ChatDocument.build(
+            title=title,
+            model=self.settings.model,
+            variant=variant,
+            prefill=prefill,
+            collection_id=collection_id,
+            collection_name=collection_name,
+        )
+        if variant == "3A":
+            # Seed the reply slot up front so completion needs no extra chat round trip.
+            document.add_assistant_placeholder(self.settings.model)
+        payload = document.payload()
 
-        endpoints = ["/api/v1/chats/new", "/api/v1/chats"]
+        endpoints = self._endpoints().order("chat_create", ["/api/v1/chats/new", "/api/v1/chats"])
         last_error: httpx.HTTPError | None = None
         data: dict | None = None
 
@@ -339,6 +673,7 @@ class OpenWebUIClient:
                 response = self._client.post(endpoint, json=payload)
                 response.raise_for_status()
                 data = response.json() if response.content else {}
+                self._endpoints().remember("chat_create", endpoint)
                 break
             except httpx.HTTPStatusError as exc:
                 status = exc.response.status_code
@@ -365,104 +700,20 @@ class OpenWebUIClient:
 
         chat_id_str = str(chat_id)
 
-        try:
-            self.link_knowledge_to_chat(
-                chat_id=chat_id_str,
-                knowledge_id=collection_id,
-                knowledge_name=collection_name,
-            )
-        except UploadError:
-            pass
-
         if variant == "3A":
             try:
                 self.complete_chat(
                     chat_id=chat_id_str,
-                    user_msg_id=user_msg_id,
+                    user_msg_id=document.user_msg_id,
                     session_id=session_id,
                     user_message=prefill,
+                    document=document,
                 )
             except UploadError:
                 pass
 
         return chat_id_str
 
-    def link_knowledge_to_chat(
-        self,
-        *,
-        chat_id: str,
-        knowledge_id: str,
-        knowledge_name: str | None,
-    ) -> None:
-        if self.dry_run:
-            return
-
-        assert self._client is not None
-        response = self._client.get(f"/api/v1/chats/{chat_id}")
-        response.raise_for_status()
-        payload = response.json()
-        chat_payload: dict | None = None
-        if isinstance(payload, dict):
-            if isinstance(payload.get("chat"), dict):
-                chat_payload = payload["chat"]
-            else:
-                chat_payload = payload
-
-        if not isinstance(chat_payload, dict):
-            raise UploadError("chat payload missing while linking knowledge")
-
-        def merge_entries(items: list | None, entry: dict) -> list:
-            items = items or []
-            merged: list[dict] = []
-            updated = False
-            for candidate in items:
-                if not isinstance(candidate, dict):
-                    continue
-                candidate_id = candidate.get("id")
-                if candidate_id and str(candidate_id) == str(entry.get("id")):
-                    merged_entry = {**candidate}
-                    for key, value in entry.items():
-                        if value and not merged_entry.get(key):
-                            merged_entry[key] = value
-                    merged.append(merged_entry)
-                    updated = True
-                else:
-                    merged.append(candidate)
-            if not updated:
-                merged.append(entry)
-            return merged
-
-        knowledge_entry = {"id": knowledge_id, "type": "collection"}
-        if knowledge_name:
-            knowledge_entry["name"] = knowledge_name
-
-        knowledge_ids = chat_payload.get("knowledge_ids")
-        ordered_ids: list[str] = []
-        if isinstance(knowledge_ids, list):
-            ordered_ids = [str(value) for value in knowledge_ids if value]
-        if knowledge_id not in ordered_ids:
-            ordered_ids.append(knowledge_id)
-        chat_payload["knowledge_ids"] = ordered_ids
-
-        chat_payload["files"] = merge_entries(chat_payload.get("files"), knowledge_entry)
-
-        chat_metadata = chat_payload.setdefault("metadata", {})
-        if knowledge_name:
-            chat_metadata.setdefault("collection_name", knowledge_name)
-
-        for message in chat_payload.get("messages", []) or []:
-            if isinstance(message, dict) and message.get("role") == "user":
-                message["files"] = merge_entries(message.get("files"), knowledge_entry)
-                metadata = message.setdefault("metadata", {})
-                metadata.setdefault("collection_id", knowledge_id)
-                if knowledge_name:
-                    metadata.setdefault("collection_name", knowledge_name)
-                break
-
-        payload = {"chat": chat_payload}
-        update_response = self._client.post(f"/api/v1/chats/{chat_id}", json=payload)
-        update_response.raise_for_status()
-
     def download_chat_export(self, *, chat_id: str, destination: Path) -> Path:
         if self.dry_run:
             raise UploadError("chat export unavailable in dry-run mode")
@@ -499,89 +750,35 @@ class OpenWebUIClient:
         user_msg_id: str,
         session_id: str,
         user_message: str,
+        document: ChatDocument | None = None,
     ) -> None:
+        """Request an assistant reply for ``chat_id`` and write it back into the chat.
+
+        Pass the ``document`` the chat was created from to skip refetching it;
+        when it already holds the assistant placeholder no extra update is sent.
+        """
+
         if self.dry_run:
             return
 
         assert self._client is not None
-        chat_payload = self._fetch_chat(chat_id)
-        assistant_msg_id = uuid.uuid4().hex
-        timestamp = int(time.time())
-
-        placeholder = {
-            "id": assistant_msg_id,
-            "role": "assistant",
-            "content": "",
-            "parentId": user_msg_id,
-            "modelName": self.settings.model,
-            "modelIdx": 0,
-            "timestamp": timestamp,
-            "done": False,
-            "statusHistory": [],
-            "childrenIds": [],
-        }
-
-        messages = chat_payload.setdefault("messages", [])
-        messages.append(placeholder)
-
-        for message in messages:
-            if isinstance(message, dict) and message.get("id") == user_msg_id:
-                children = message.setdefault("childrenIds", [])
-                if assistant_msg_id not in children:
-                    children.append(assistant_msg_id)
-                break
-
-        history = chat_payload.setdefault("history", {})
-        history_messages = history.setdefault("messages", {})
-        history_messages[assistant_msg_id] = {
-            "id": assistant_msg_id,
-            "role": "assistant",
-            "content": "",
-            "timestamp": timestamp,
-            "parentId": user_msg_id,
-            "model": self.settings.model,
-            "modelName": self.settings.model,
-            "modelIdx": 0,
-            "childrenIds": [],
-            "statusHistory": [],
-            "done": False,
-        }
-        parent_entry = history_messages.get(user_msg_id)
-        if isinstance(parent_entry, dict):
-            children = parent_entry.setdefault("childrenIds", [])
-            if assistant_msg_id not in children:
-                children.append(assistant_msg_id)
-
-        history["current_id"] = assistant_msg_id
-        history["currentId"] = assistant_msg_id
-        chat_payload["currentId"] = assistant_msg_id
-
-        self._client.post(
-            f"/api/v1/chats/{chat_id}", json={"chat": chat_payload}
-        ).raise_for_status()
-
-        conversation: List[Dict[str, str]] = []
-        for message in chat_payload.get("messages", []) or []:
-            if not isinstance(message, dict):
-                continue
-            role = message.get("role")
-            content = message.get("content")
-            if role not in {"user", "assistant"}:
-                continue
-            if role == "assistant" and not content:
-                continue
-            if content is None:
-                continue
-            conversation.append({"role": role, "content": content})
-        if not conversation:
-            conversation.append({"role": "user", "content": user_message})
+        if document is None:
+            document = ChatDocument(chat=self._fetch_chat(chat_id), user_msg_id=user_msg_id)
+        if document.assistant_msg_id is None:
+            document.add_assistant_placeholder(self.settings.model)
+            self._client.post(
+                f"/api/v1/chats/{chat_id}", json=document.payload()
+            ).raise_for_status()
+        assistant_msg_id = document.assistant_msg_id
+        assert assistant_msg_id is not None
+        conversation = document.conversation(user_message)
 
         completion_payload = {
             "chat_id": chat_id,
             "id": assistant_msg_id,
             "messages": conversation,
             "model": self.settings.model,
-            "stream": False,
+            "stream": self.settings.stream_completions,
             "background_tasks": {
                 "title_generation": False,
                 "tags_generation": False,
@@ -599,41 +796,48 @@ class OpenWebUIClient:
                 "{{CURRENT_DATETIME}}": datetime.now(timezone.utc).isoformat(),
                 "{{CURRENT_TIMEZONE}}": "UTC",
             },
-            "session_id": session_id,
         }
-
-        completion_response = self._client.post(
-            "/api/chat/completions",
-            json=completion_payload,
-            timeout=180.0,
-        )
-        completion_response.raise_for_status()
-
-        completion_data = completion_response.json()
-        task_id = None
-        if isinstance(completion_data, dict):
-            task_id = completion_data.get("task_id") or completion_data.get("id")
-
-        if task_id:
-            self._wait_for_completion(chat_id, str(task_id))
-
-        refreshed = self._fetch_chat(chat_id)
-        assistant_text = self._extract_assistant_text(completion_data)
-        if not assistant_text:
-            assistant_text = self._extract_assistant_from_chat(refreshed, assistant_msg_id)
-        if not assistant_text:
-            assistant_text = self._extract_assistant_from_history(refreshed, assistant_msg_id)
+        if not self.settings.stream_completions:
+            # With a socket session alongside chat_id and id, Open WebUI runs the
+            # completion as a background task and answers with a task id instead
+            # of an event stream, so it is only sent when polling.
+            completion_payload["session_id"] = session_id
+
+        assistant_text, completion_data = self._request_completion(completion_payload)
+        if completion_data is None:
+            # The stream already carried the full reply; no task wait or refetch needed.
+            refreshed = document
+        else:
+            task_id = None
+            if isinstance(completion_data, dict):
+                task_id = completion_data.get("task_id") or completion_data.get("id")
+
+            assistant_text = self._extract_assistant_text(completion_data)
+            refreshed = document
+            if task_id or not assistant_text:
+                # The server finishes (and writes) the reply itself; work on its copy.
+                if task_id:
+                    self._wait_for_completion(chat_id, str(task_id))
+                refreshed = ChatDocument(
+                    chat=self._fetch_chat(chat_id),
+                    user_msg_id=document.user_msg_id,
+                    assistant_msg_id=assistant_msg_id,
+                )
+            if not assistant_text:
+                assistant_text = self._extract_assistant_from_chat(refreshed.chat, assistant_msg_id)
+            if not assistant_text:
+                assistant_text = self._extract_assistant_from_history(
+                    refreshed.chat, assistant_msg_id
+                )
 
         if assistant_text:
             assistant_text = (
                 assistant_text if assistant_text.endswith("\n") else assistant_text + "\n"
             )
-            self._update_assistant_message(
-                chat_id=chat_id,
-                chat_payload=refreshed,
-                assistant_msg_id=assistant_msg_id,
-                assistant_text=assistant_text,
-            )
+            refreshed.set_assistant_reply(assistant_msg_id, assistant_text, self.settings.model)
+            self._client.post(
+                f"/api/v1/chats/{chat_id}", json=refreshed.payload()
+            ).raise_for_status()
 
         self._client.post(
             "/api/chat/completed",
@@ -645,6 +849,62 @@ class OpenWebUIClient:
             },
         ).raise_for_status()
 
+    def _request_completion(self, payload: Dict[str, Any]) -> tuple[str, Any]:
+        """Post a completion request, consuming the reply as a stream when asked to.
+
+        Returns the streamed text with ``None`` as the second item, or an empty
+        string and the decoded JSON body when the server answered without
+        streaming.
+        """
+
+        assert self._client is not None
+        if not payload.get("stream"):
+            response = self._client.post("/api/chat/completions", json=payload, timeout=180.0)
+            response.raise_for_status()
+            return "", response.json()
+
+        timeout = httpx.Timeout(60.0, read=180.0)
+        with self._client.stream(
+            "POST", "/api/chat/completions", json=payload, timeout=timeout
+        ) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "")
+            if "text/event-stream" not in content_type:
+                response.read()
+                return "", response.json()
+            return self._read_completion_stream(response.iter_lines()).strip(), None
+
+    @staticmethod
+    def _read_completion_stream(lines: Iterable[str]) -> str:
+        parts: List[str] = []
+        for line in lines:
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:") :].strip()
+            if data == "[DONE]":
+                break
+            try:
+                chunk = json.loads(data)
+            except ValueError:
+                continue
+            if not isinstance(chunk, dict):
+                continue
+            finished = bool(chunk.get("done"))
+            for choice in chunk.get("choices") or []:
+                if not isinstance(choice, dict):
+                    continue
+                delta = choice.get("delta")
+                if isinstance(delta, dict) and isinstance(delta.get("content"), str):
+                    parts.append(delta["content"])
+                message = choice.get("message")
+                if isinstance(message, dict) and isinstance(message.get("content"), str):
+                    parts.append(message["content"])
+                if choice.get("finish_reason"):
+                    finished = True
+            if finished:
+                break
+        return "".join(parts)
+
     def _fetch_chat(self, chat_id: str) -> Dict[str, Any]:
         assert self._client is not None
         response = self._client.get(f"/api/v1/chats/{chat_id}")
@@ -727,66 +987,6 @@ class OpenWebUIClient:
                     return content.strip()
         return ""
 
-    def _update_assistant_message(
-        self,
-        *,
-        chat_id: str,
-        chat_payload: Dict[str, Any],
-        assistant_msg_id: str,
-        assistant_text: str,
-    ) -> None:
-        assert self._client is not None
-        messages = chat_payload.setdefault("messages", [])
-        found = False
-        for message in messages:
-            if isinstance(message, dict) and message.get("id") == assistant_msg_id:
-                message["content"] = assistant_text
-                message["done"] = True
-                message.setdefault("statusHistory", [])
-                found = True
-                break
-        if not found:
-            messages.append(
-                {
-                    "id": assistant_msg_id,
-                    "role": "assistant",
-                    "content": assistant_text,
-                    "done": True,
-                    "statusHistory": [],
-                    "timestamp": int(time.time()),
-                    "parentId": None,
-                }
-            )
-
-        history = chat_payload.setdefault("history", {})
-        history_messages = history.setdefault("messages", {})
-        assistant_entry = history_messages.get(assistant_msg_id)
-        if isinstance(assistant_entry, dict):
-            assistant_entry["content"] = assistant_text
-            assistant_entry["done"] = True
-            assistant_entry.setdefault("statusHistory", [])
-            assistant_entry["model"] = self.settings.model
-        else:
-            history_messages[assistant_msg_id] = {
-                "id": assistant_msg_id,
-                "role": "assistant",
-                "content": assistant_text,
-                "done": True,
-                "statusHistory": [],
-                "model": self.settings.model,
-                "modelName": self.settings.model,
-                "timestamp": int(time.time()),
-            }
-
-        history["current_id"] = assistant_msg_id
-        history["currentId"] = assistant_msg_id
-        chat_payload["currentId"] = assistant_msg_id
-
-        self._client.post(
-            f"/api/v1/chats/{chat_id}",
-            json={"chat": chat_payload},
-        ).raise_for_status()
-
     def _wait_for_completion(self, chat_id: str, task_id: str, *, timeout: float = 180.0) -> None:
         assert self._client is not None
         deadline = time.time() + timeout
@@ -825,13 +1025,49 @@ def _load_manifest(manifest_path: Path) -> list[ArtifactRecord]:
     ]
 
 
+def _upload_and_wait(client: OpenWebUIClient, artifact_path: Path) -> tuple[str, float]:
+    file_id = client.upload_markdown(artifact_path)
+    started = time.monotonic()
+    status = client.poll_file(file_id)
+    elapsed = time.monotonic() - started
+    if status not in {"processed", "ready", "completed", "success"}:
+        raise UploadError(f"artifact {artifact_path.name} failed processing ({status})")
+    return file_id, elapsed
+
+
+def _discard_collection(client: OpenWebUIClient, collection: Future[str], ingest_log: Path) -> None:
+    """Delete the collection created for an upload that then failed, if it was created."""
+
+    try:
+        collection_id = collection.result()
+    except Exception:
+        return
+    try:
+        client.delete_collection(collection_id)
+    except httpx.HTTPError as exc:
+        _append_ingest_log(ingest_log, f"collection cleanup failed id={collection_id} detail={exc}")
+        return
+    _append_ingest_log(ingest_log, f"collection removed id={collection_id} reason=upload failed")
+
+
 def upload_artifacts(
     session_id: str,
     artifacts_dir: Path,
     settings: Settings,
     *,
     variant: str,
+    workers: int | None = None,
 ) -> UploadResult:
+    """Upload manifest artifacts, wait for processing and attach them to a new collection.
+
+    Up to ``workers`` artifacts (``settings.upload_workers`` by default) are
+    uploaded and polled concurrently. The collection is created once the first
+    artifact has processed, overlapping the remaining uploads, and is deleted
+    again if a later upload fails. Files are then attached in bulk. Ingest log
+    entries are still written in manifest order, and files that fail to attach
+    are reported in ``failed_attachments``.
+    """
+
     artifacts_dir = Path(artifacts_dir)
     manifest_path = artifacts_dir / "run.json"
     ingest_log = artifacts_dir / "ingest.log"
@@ -843,34 +1079,77 @@ def upload_artifacts(
     if not artifact_records:
         raise UploadError("manifest has no artifacts to upload")
 
+    for record in artifact_records:
+        if not (artifacts_dir / record.filename).exists():
+            raise UploadError(f"artifact missing on disk: {record.filename}")
+
+    workers = max(1, workers if workers is not None else settings.upload_workers)
+    timestamp = datetime.now(timezone.utc)
+    collection_name = f"oh-{session_id}-{timestamp.strftime('%Y%m%d')}"
+    description = f"Artifacts for session {session_id} ({settings.project})"
+
     client = OpenWebUIClient(settings)
     file_ids: list[str] = []
 
     try:
-        for record in artifact_records:
-            artifact_path = artifacts_dir / record.filename
-            if not artifact_path.exists():
-                raise UploadError(f"artifact missing on disk: {record.filename}")
-
-            file_id = client.upload_markdown(artifact_path)
-            _append_ingest_log(ingest_log, f"upload requested file={record.filename} id={file_id}")
-            status = client.poll_file(file_id)
-            if status not in {"processed", "ready", "completed", "success"}:
-                raise UploadError(f"artifact {record.filename} failed processing ({status})")
-            file_ids.append(file_id)
-            _append_ingest_log(ingest_log, f"upload processed file={record.filename} id={file_id}")
-
-        timestamp = datetime.now(timezone.utc)
-        collection_name = f"oh-{session_id}-{timestamp.strftime('%Y%m%d')}"
-        description = f"Artifacts for session {session_id} ({settings.project})"
-        collection_id = client.create_collection(collection_name, description)
+        # The collection gets its own thread so it is not queued behind pending uploads.
+        with (
+            ThreadPoolExecutor(max_workers=workers) as executor,
+            ThreadPoolExecutor(max_workers=1) as collection_pool,
+        ):
+            uploads = [
+                executor.submit(_upload_and_wait, client, artifacts_dir / record.filename)
+                for record in artifact_records
+            ]
+            collection: Future[str] | None = None
+            try:
+                for record, upload in zip(artifact_records, uploads):
+                    file_id, elapsed = upload.result()
+                    if collection is None:
+                        collection = collection_pool.submit(
+                            client.create_collection, collection_name, description
+                        )
+                    file_ids.append(file_id)
+                    _append_ingest_log(
+                        ingest_log, f"upload requested file={record.filename} id={file_id}"
+                    )
+                    _append_ingest_log(
+                        ingest_log,
+                        f"upload processed file={record.filename} id={file_id} "
+                        f"elapsed={elapsed:.2f}s",
+                    )
+                assert collection is not None
+                collection_id = collection.result()
+            except BaseException:
+                for upload in uploads:
+                    upload.cancel()
+                if collection is not None:
+                    _discard_collection(client, collection, ingest_log)
+                raise
+
         _append_ingest_log(
             ingest_log, f"collection ready id={collection_id} name={collection_name}"
         )
 
-        for file_id in file_ids:
-            client.attach_file(collection_id, file_id)
-            _append_ingest_log(ingest_log, f"collection attach id={collection_id} file={file_id}")
+        outcomes = client.attach_files(collection_id, file_ids, concurrency=workers)
+        failed = [outcome.file_id for outcome in outcomes if not outcome.attached]
+        if failed:
+            # Retry only the files that did not attach, one request per file.
+            retried = client.attach_files(collection_id, failed, concurrency=workers, batch=False)
+            retry_outcomes = {outcome.file_id: outcome for outcome in retried}
+            outcomes = [retry_outcomes.get(outcome.file_id, outcome) for outcome in outcomes]
+
+        for outcome in outcomes:
+            if outcome.attached:
+                _append_ingest_log(
+                    ingest_log, f"collection attach id={collection_id} file={outcome.file_id}"
+                )
+            else:
+                _append_ingest_log(
+                    ingest_log,
+                    f"collection attach failed id={collection_id} file={outcome.file_id} "
+                    f"detail={outcome.error}",
+                )
 
         return UploadResult(
             session_id=session_id,
@@ -879,12 +1158,15 @@ def upload_artifacts(
             file_ids=file_ids,
             variant=variant,
             dry_run=client.dry_run,
+            failed_attachments=[outcome.file_id for outcome in outcomes if not outcome.attached],
         )
     finally:
         client.close()
 
 
 __all__ = [
+    "AttachOutcome",
+    "ChatDocument",
     "OpenWebUIClient",
     "UploadError",
     "UploadResult",
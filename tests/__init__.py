@@ -1,3 +1,5 @@
+import json
+from datetime import datetime, timezone
 from pathlib import Path
 
 import pytest
@@ -13,9 +15,25 @@ def settings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Settings:
     monkeypatch.setenv("BRANCH", "main")
     monkeypatch.setenv("OH2WEBUI_MODEL", "openai/gpt-4o-mini")
     monkeypatch.setenv("OH2WEBUI_DRY_RUN", "true")
+    monkeypatch.setenv("OH2WEBUI_ENDPOINT_CACHE", str(tmp_path / "endpoints.json"))
     monkeypatch.delenv("OPENWEBUI_BASE_URL", raising=False)
     monkeypatch.delenv("OPENWEBUI_API_TOKEN", raising=False)
     return load_settings()
 
 
-__all__ = ["settings"]
+def seed_session(root: Path, session_id: str) -> Path:
+    """Create a raw session under ``root`` with a single meaningful event."""
+
+    raw_dir = root / session_id
+    raw_dir.mkdir(parents=True)
+    event = {
+        "step": "002",
+        "role": "assistant",
+        "content": f"Finished {session_id}",
+        "ts": datetime(2025, 1, 4, 9, 0, tzinfo=timezone.utc).isoformat(),
+    }
+    (raw_dir / "events.jsonl").write_text(json.dumps(event) + "\n", encoding="utf-8")
+    return raw_dir
+
+
+__all__ = ["seed_session", "settings"]
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from oh2webui_cli.batch import discover_sessions, distill_sessions
+
+from . import seed_session
+
+
+def test_distill_sessions_reports_failures(tmp_path: Path, settings) -> None:
+    sessions_root = tmp_path / "sessions"
+    for session_id in ("alpha", "beta", "gamma"):
+        seed_session(sessions_root, session_id)
+    (sessions_root / "empty").mkdir()
+    (sessions_root / "malformed").mkdir()
+    (sessions_root / "malformed" / "events.jsonl").write_text("[1,2]\n", encoding="utf-8")
+
+    session_ids = discover_sessions(sessions_root)
+    assert session_ids == ["alpha", "beta", "empty", "gamma", "malformed"]
+
+    artifacts_root = tmp_path / "artifacts"
+    batch = distill_sessions(session_ids, sessions_root, artifacts_root, settings, workers=2)
+
+    assert [outcome.session_id for outcome in batch.outcomes] == session_ids
+    assert [outcome.session_id for outcome in batch.failed] == ["empty", "malformed"]
+    assert "no event files" in (batch.failed[0].error or "")
+    assert batch.failed[1].error
+    assert len(batch.succeeded) == 3
+    transcript = artifacts_root / "beta" / "session-transcript.md"
+    assert "Finished beta" in transcript.read_text(encoding="utf-8")
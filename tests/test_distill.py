@@ -1,8 +1,22 @@
+import dataclasses
+import hashlib
+import io
 import json
-from datetime import datetime, timezone
+import random
+import re
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from oh2webui_cli.distiller import distill_session
+import pytest
+
+from oh2webui_cli.distiller import (
+    DistillationError,
+    _summarise_content,
+    _summarise_groups,
+    _write_steps,
+    distill_session,
+)
+from oh2webui_cli.grouper import ContentRef, Event, EventGroup, LazyEvent
 
 
 def _write_events(raw_dir: Path) -> None:
@@ -59,6 +73,14 @@ def test_distill_creates_artifacts(tmp_path: Path, settings) -> None:
     assert "session-123" in sample_content
     assert "Step 2" in sample_content
     assert "Executed build script successfully." in sample_content
+
+    front_matter, body = transcript_path.read_bytes().split(b"\n---\n\n", 1)
+    assert json.loads(front_matter[4:])["hash"] == hashlib.sha256(body).hexdigest()
+    assert sorted(path.name for path in artifacts_dir.iterdir()) == [
+        "ingest.log",
+        "run.json",
+        "session-transcript.md",
+    ]
     assert "Initial instructions" not in sample_content
 
 
@@ -93,3 +115,337 @@ def test_distill_uses_inferred_status_in_filename(tmp_path: Path, settings) -> N
     transcript = (artifacts_dir / record.filename).read_text(encoding="utf-8")
     assert "Step 10" in transcript
     assert "Executed task" in transcript
+
+
+def test_per_step_artifacts_are_deduplicated_by_content(tmp_path: Path, settings) -> None:
+    raw_dir = tmp_path / "session-raw"
+    raw_dir.mkdir()
+    start = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+    events = [
+        {"step": "001", "content": "Initial instructions"},
+        {"step": "002", "content": "Run tests", "metadata": {"cwd": "/repo"}},
+        {"step": "002", "role": "tool", "content": "3 failed", "metadata": {"exit_code": 1}},
+        {"step": "003", "content": "Run  tests\n", "metadata": {"cwd": "/elsewhere"}},
+        {"step": "003", "role": "tool", "content": "3 failed", "metadata": {"exit_code": 1}},
+        {"step": "004", "content": "Fixed the fixture", "success": True},
+    ]
+    with (raw_dir / "events.jsonl").open("w", encoding="utf-8") as handle:
+        for minute, item in enumerate(events):
+            item["ts"] = (start + timedelta(minutes=minute)).isoformat()
+            handle.write(json.dumps(item) + "\n")
+
+    artifacts_dir = tmp_path / "artifacts"
+    artifacts_dir.mkdir()
+    (artifacts_dir / "artifact-009-deadbeef-success.md").write_text("stale", encoding="utf-8")
+    result = distill_session("session-steps", raw_dir, artifacts_dir, settings, per_step=True)
+
+    assert result.deduplicated == 1
+    assert [(record.step, record.status) for record in result.artifacts] == [
+        ("002", "failed"),
+        ("004", "success"),
+    ]
+    for record in result.artifacts:
+        assert record.filename == f"artifact-{record.step}-{record.hash[:8]}-{record.status}.md"
+    assert sorted(path.name for path in artifacts_dir.glob("*.md")) == sorted(
+        record.filename for record in result.artifacts
+    )
+
+    artifact = (artifacts_dir / result.artifacts[0].filename).read_text(encoding="utf-8")
+    front_matter = json.loads(artifact.split("\n---\n", 1)[0][4:])
+    assert (front_matter["status"], front_matter["exit"], front_matter["cwd"]) == (
+        "failed",
+        1,
+        "/repo",
+    )
+    assert "# Step 2: Run tests" in artifact
+    manifest = json.loads(result.manifest_path.read_text(encoding="utf-8"))
+    assert manifest["artifact_count"] == 2
+
+    bootstrap_only = {"step": "001", "content": "Initial instructions", "ts": start.isoformat()}
+    (raw_dir / "events.jsonl").write_text(json.dumps(bootstrap_only) + "\n", encoding="utf-8")
+    with pytest.raises(DistillationError):
+        distill_session("session-steps", raw_dir, artifacts_dir, settings, per_step=True)
+    assert sorted(path.name for path in artifacts_dir.glob("artifact-*.md")) == sorted(
+        record.filename for record in result.artifacts
+    )
+
+
+def _transcript_body(path: Path) -> str:
+    return path.read_text(encoding="utf-8").split("---\n\n", 1)[1]
+
+
+def test_streaming_distill_keeps_source_order_for_interleaved_steps(
+    tmp_path: Path, settings
+) -> None:
+    raw_dir = tmp_path / "session-raw"
+    raw_dir.mkdir()
+    start = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+    events = [
+        ("003", "Deploy preview.", 5),
+        ("002", "Build the app.", 1),
+        ("003", "Preview is live.", 6),
+        ("002", "Build finished.", 2),
+    ]
+    with (raw_dir / "events.jsonl").open("w", encoding="utf-8") as handle:
+        for step, content, minute in events:
+            ts = (start + timedelta(minutes=minute)).isoformat()
+            handle.write(json.dumps({"step": step, "content": content, "ts": ts}) + "\n")
+
+    distill_session("s", raw_dir, tmp_path / "default", settings)
+    distill_session("s", raw_dir, tmp_path / "stream", settings, streaming=True)
+
+    default = _transcript_body(tmp_path / "default" / "session-transcript.md")
+    streamed = _transcript_body(tmp_path / "stream" / "session-transcript.md")
+    assert re.findall(r"^Step \d+$", default, re.M) == ["Step 2", "Step 3"]
+    assert re.findall(r"^Step \d+$", streamed, re.M) == ["Step 3", "Step 2", "Step 3", "Step 2"]
+
+
+def test_incremental_distill_matches_full_rebuild(tmp_path: Path, settings) -> None:
+    raw_dir = tmp_path / "session-raw"
+    raw_dir.mkdir()
+    _write_events(raw_dir)
+
+    artifacts_dir = tmp_path / "artifacts"
+    distill_session(
+        session_id="session-789",
+        raw_root=raw_dir,
+        artifacts_root=artifacts_dir,
+        settings=settings,
+        incremental=True,
+    )
+    checkpoint = json.loads((artifacts_dir / "run.checkpoint.json").read_text(encoding="utf-8"))
+    assert checkpoint["events_parsed"] == 3
+    assert checkpoint["sources"][0]["last_index"] == 3
+
+    appended = {
+        "step": "003",
+        "role": "assistant",
+        "content": "Deployed preview environment.",
+        "ts": datetime(2025, 1, 1, 10, 9, tzinfo=timezone.utc).isoformat(),
+    }
+    with (raw_dir / "events.jsonl").open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(appended) + "\n")
+
+    result = distill_session(
+        session_id="session-789",
+        raw_root=raw_dir,
+        artifacts_root=artifacts_dir,
+        settings=settings,
+        incremental=True,
+    )
+    incremental_body = _transcript_body(artifacts_dir / "session-transcript.md")
+    assert "Step 3\nDeployed preview environment." in incremental_body
+
+    full_dir = tmp_path / "full"
+    full = distill_session(
+        session_id="session-789",
+        raw_root=raw_dir,
+        artifacts_root=full_dir,
+        settings=settings,
+    )
+    assert incremental_body == _transcript_body(full_dir / "session-transcript.md")
+    assert result.artifacts[0].hash == full.artifacts[0].hash
+
+    checkpoint = json.loads((artifacts_dir / "run.checkpoint.json").read_text(encoding="utf-8"))
+    assert checkpoint["events_parsed"] == 4
+
+    _write_events(raw_dir)
+    distill_session(
+        session_id="session-789",
+        raw_root=raw_dir,
+        artifacts_root=artifacts_dir,
+        settings=settings,
+        incremental=True,
+    )
+    log = (artifacts_dir / "ingest.log").read_text(encoding="utf-8")
+    assert "checkpoint reset" in log
+    assert "Step 3" not in _transcript_body(artifacts_dir / "session-transcript.md")
+
+
+def test_incremental_distill_breaks_timestamp_ties_like_full_rebuild(
+    tmp_path: Path, settings
+) -> None:
+    raw_dir = tmp_path / "session-raw"
+    (raw_dir / "events").mkdir(parents=True)
+    first = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc).isoformat()
+    tied = datetime(2025, 1, 1, 10, 5, tzinfo=timezone.utc).isoformat()
+    (raw_dir / "events.jsonl").write_text(
+        json.dumps({"step": "002", "role": "user", "content": "Build it.", "ts": first}) + "\n",
+        encoding="utf-8",
+    )
+    (raw_dir / "events" / "0001.json").write_text(
+        json.dumps({"step": "003", "role": "assistant", "content": "From events dir.", "ts": tied}),
+        encoding="utf-8",
+    )
+
+    artifacts_dir = tmp_path / "artifacts"
+    distill_session(
+        session_id="session-ties",
+        raw_root=raw_dir,
+        artifacts_root=artifacts_dir,
+        settings=settings,
+        incremental=True,
+    )
+    appended = [
+        {"step": "004", "role": "assistant", "content": "Ran the tests.", "ts": tied},
+        {"step": "003", "role": "assistant", "content": "From events.jsonl.", "ts": tied},
+    ]
+    with (raw_dir / "events.jsonl").open("a", encoding="utf-8") as handle:
+        handle.writelines(json.dumps(event) + "\n" for event in appended)
+
+    distill_session(
+        session_id="session-ties",
+        raw_root=raw_dir,
+        artifacts_root=artifacts_dir,
+        settings=settings,
+        incremental=True,
+    )
+    incremental_body = _transcript_body(artifacts_dir / "session-transcript.md")
+
+    full_dir = tmp_path / "full"
+    distill_session(
+        session_id="session-ties",
+        raw_root=raw_dir,
+        artifacts_root=full_dir,
+        settings=settings,
+    )
+    assert incremental_body == _transcript_body(full_dir / "session-transcript.md")
+    assert incremental_body.index("Step 4") < incremental_body.index("Step 3")
+    assert "Step 3\nFrom events.jsonl." in incremental_body
+
+
+def test_lazy_content_distill_matches_default(tmp_path: Path, settings) -> None:
+    raw_dir = tmp_path / "session-raw"
+    raw_dir.mkdir()
+    _write_events(raw_dir)
+    log = "".join(f"line {index}: ok\n" for index in range(2000))
+    record = {
+        "step": "002",
+        "role": "tool",
+        "content": log,
+        "ts": datetime(2025, 1, 1, 10, 2, tzinfo=timezone.utc).isoformat(),
+    }
+    with (raw_dir / "events.jsonl").open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(record) + "\n")
+
+    distill_session("session-lazy", raw_dir, tmp_path / "default", settings)
+    lazy = dataclasses.replace(settings, lazy_content=True)
+    for name in ("lazy", "lazy-again"):
+        distill_session("session-lazy", raw_dir, tmp_path / name, lazy)
+        assert _transcript_body(tmp_path / name / "session-transcript.md") == _transcript_body(
+            tmp_path / "default" / "session-transcript.md"
+        )
+
+
+def test_lazy_per_step_distill_loads_each_record_once(
+    tmp_path: Path, settings, monkeypatch
+) -> None:
+    raw_dir = tmp_path / "session-raw"
+    raw_dir.mkdir()
+    _write_events(raw_dir)
+    start = datetime(2025, 1, 1, 11, 0, tzinfo=timezone.utc)
+    records = [
+        {"step": "005", "role": "user", "content": "Check the logs.", "ts": start.isoformat()},
+        {
+            "step": "005",
+            "role": "tool",
+            "content": "".join(f"line {index}: ok\n" for index in range(2000)),
+            "ts": (start + timedelta(minutes=1)).isoformat(),
+        },
+    ]
+    with (raw_dir / "events.jsonl").open("a", encoding="utf-8") as handle:
+        handle.writelines(json.dumps(record) + "\n" for record in records)
+    distill_session("session-lazy", raw_dir, tmp_path / "default", settings, per_step=True)
+
+    loads: list[ContentRef] = []
+    load = ContentRef.load
+
+    def counting_load(ref: ContentRef) -> str:
+        loads.append(ref)
+        return load(ref)
+
+    monkeypatch.setattr(ContentRef, "load", counting_load)
+    lazy = dataclasses.replace(settings, lazy_content=True)
+    result = distill_session("session-lazy", raw_dir, tmp_path / "lazy", lazy, per_step=True)
+
+    assert len(loads) == 1
+    for record in result.artifacts:
+        assert (tmp_path / "lazy" / record.filename).read_text(encoding="utf-8") == (
+            tmp_path / "default" / record.filename
+        ).read_text(encoding="utf-8")
+
+
+def test_summarise_groups_uses_group_bounds_and_stops_at_summary(tmp_path: Path) -> None:
+    start = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+    missing = ContentRef(str(tmp_path / "missing.jsonl"), 0, 10)
+    group = EventGroup(
+        step="002",
+        events=[
+            Event("002", "user", "```\nfenced only\n```", start),
+            Event("002", "assistant", "Ran the suite", start + timedelta(minutes=1)),
+            LazyEvent("002", "tool", missing, start + timedelta(minutes=2)),
+        ],
+        started_at=start - timedelta(minutes=5),
+        completed_at=start + timedelta(hours=1),
+    )
+
+    body = io.BytesIO()
+    digest, events, first, last = _write_steps(body, _summarise_groups([group]))
+
+    assert body.getvalue() == b"Step 2\nRan the suite\n"
+    assert digest == hashlib.sha256(body.getvalue()).hexdigest()
+    assert events == 3
+    assert (first, last) == (group.started_at, group.completed_at)
+
+
+def _reference_summarise(raw: str) -> str:
+    # The original multi-pass implementation, kept to pin the output format.
+    tokens: list[str] = []
+    in_code_block = False
+    for original_line in raw.splitlines():
+        line = original_line.strip()
+        if line.startswith("```"):
+            in_code_block = not in_code_block
+            continue
+        if in_code_block or not line:
+            continue
+        line = re.sub(r"^[#>*-]+\s*", "", line)
+        line = re.sub(r"^\d+[.)]\s*", "", line)
+        line = re.sub(r"```[A-Za-z0-9_-]*", "", line)
+        line = re.sub(r"\s+", " ", line)
+        tokens.append(line)
+    summary = re.sub(r"\s+", " ", " ".join(tokens).strip())
+    if len(summary) > 200:
+        summary = summary[:197].rstrip() + "..."
+    return summary
+
+
+def test_summarise_content_matches_reference_output() -> None:
+    pieces = [
+        "# Heading",
+        "> quoted 12) text",
+        "- 3. item",
+        "```python",
+        "print('hidden')",
+        "```",
+        " \t```",
+        "inline ```bash fence``` here",
+        "  \t spaced out  ",
+        "1) done",
+        "***",
+        "x" * 150,
+        "tail\x0bvertical",
+        "nb\xa0sp 4.\u3000wide",
+        "",
+        "word " * 30,
+    ]
+    separators = ["\n", "\r\n", "\r", " ", "\x1c", "\x85", "\u2028"]
+    rng = random.Random(7)
+    for _ in range(500):
+        raw = "".join(
+            rng.choice(pieces) + rng.choice(separators) for _ in range(rng.randint(0, 12))
+        )
+        assert _summarise_content(raw) == _reference_summarise(raw)
+
+    huge = "Ran the suite\n" + "```\n" + "log line\n" * 200_000 + "```\n" + "ok " * 500
+    assert _summarise_content(huge) == _reference_summarise(huge)
@@ -0,0 +1,167 @@
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from oh2webui_cli import eventcache
+from oh2webui_cli.distiller import distill_session
+from oh2webui_cli.eventcache import CACHE_NAME, load_events
+from oh2webui_cli.grouper import Event, iter_events
+
+
+def _write_session(raw: Path) -> None:
+    raw.mkdir(parents=True, exist_ok=True)
+    records = [
+        {"step": "002", "role": "user", "content": "héllo", "ts": "2024-05-01T10:00:00+02:00"},
+        {"step": "002", "role": "tool", "content": "", "timestamp": 1714550400.25},
+        {"step": "003", "role": "assistant", "content": "ok", "success": False, "tags": ["a"]},
+    ]
+    (raw / "events.jsonl").write_text(
+        "\n".join(json.dumps(record) for record in records) + "\n", encoding="utf-8"
+    )
+    (raw / "events").mkdir(exist_ok=True)
+    (raw / "events" / "0.json").write_text(
+        json.dumps({"step": "004", "content": "naive", "ts": "2024-05-01T10:00:00.123456"}),
+        encoding="utf-8",
+    )
+
+
+def test_load_events_round_trips_through_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    raw = tmp_path / "raw"
+    _write_session(raw)
+    expected = list(iter_events(raw))
+
+    assert load_events(raw) == expected
+    assert (raw / CACHE_NAME).exists()
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("sources were re-parsed")
+
+    monkeypatch.setattr(eventcache, "iter_events", _fail)
+    cached = load_events(raw)
+    assert cached == expected
+    assert cached[0].timestamp.utcoffset() == timedelta(hours=2)
+    assert cached[3].timestamp == datetime(2024, 5, 1, 10, 0, 0, 123456)
+    assert cached[3].timestamp.tzinfo is None
+
+
+def test_load_events_rebuilds_when_sources_change(tmp_path: Path) -> None:
+    raw = tmp_path / "raw"
+    _write_session(raw)
+    load_events(raw)
+
+    with (raw / "events.jsonl").open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"step": "005", "content": "late"}) + "\n")
+    stat = (raw / "events.jsonl").stat()
+    os.utime(raw / "events.jsonl", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    events = load_events(raw)
+    assert [event.content for event in events][-2:] == ["late", "naive"]
+    assert events == list(iter_events(raw))
+
+
+def test_corrupt_cache_is_ignored(tmp_path: Path) -> None:
+    raw = tmp_path / "raw"
+    _write_session(raw)
+    load_events(raw)
+    cache = raw / CACHE_NAME
+    cache.write_bytes(cache.read_bytes()[:-5])
+
+    assert load_events(raw) == list(iter_events(raw))
+    assert eventcache._read(cache, eventcache._source_key(raw)) is not None
+
+
+def _rewrite_cache(cache: Path, edit) -> None:
+    data = cache.read_bytes()
+    position = len(eventcache._MAGIC)
+    (size,) = eventcache._HEADER.unpack_from(data, position)
+    position += eventcache._HEADER.size
+    header = json.loads(data[position : position + size])
+    blobs = []
+    position += size
+    for blob_size in header["sizes"]:
+        blobs.append(data[position : position + blob_size])
+        position += blob_size
+    header = edit(header, blobs)
+    encoded = json.dumps(header).encode("utf-8")
+    cache.write_bytes(
+        eventcache._MAGIC + eventcache._HEADER.pack(len(encoded)) + encoded + b"".join(blobs)
+    )
+
+
+def _replace_metadata(header: dict, blobs: list[bytes]) -> dict:
+    blobs[-1] = b'{"not": "a list"}'
+    header["sizes"][-1] = len(blobs[-1])
+    return header
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        lambda header, blobs: [header],
+        lambda header, blobs: {**header, "strings": None},
+        lambda header, blobs: {key: value for key, value in header.items() if key != "count"},
+        _replace_metadata,
+    ],
+    ids=["header-list", "strings", "count", "metadata"],
+)
+def test_undecodable_cache_is_a_miss(tmp_path: Path, edit) -> None:
+    raw = tmp_path / "raw"
+    _write_session(raw)
+    expected = load_events(raw)
+    cache = raw / CACHE_NAME
+
+    _rewrite_cache(cache, edit)
+    assert load_events(raw) == expected
+    _rewrite_cache(cache, edit)
+    assert list(eventcache.load_store(raw)) == expected
+
+
+def test_distill_writes_no_cache_by_default(tmp_path: Path, settings) -> None:
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    record = {"step": "002", "content": "done", "ts": 1714550400}
+    (raw / "events.jsonl").write_text(json.dumps(record) + "\n", encoding="utf-8")
+
+    assert not settings.event_cache
+    distill_session("s", raw, tmp_path / "artifacts", settings)
+    assert not (raw / CACHE_NAME).exists()
+
+
+@pytest.mark.parametrize(
+    "metadata", [{"note": "bad \udc80 surrogate"}, {"seen": {"a"}}], ids=["surrogate", "set"]
+)
+def test_unserialisable_events_skip_the_cache(tmp_path: Path, metadata: dict) -> None:
+    cache = tmp_path / CACHE_NAME
+    event = Event("002", "user", "text", datetime(2024, 5, 1), None, metadata)
+
+    eventcache._write(cache, [], [event])
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_streaming_distill_does_not_read_the_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, settings
+) -> None:
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    records = [
+        {"step": "002", "content": f"event {index}", "ts": 1714550400 + index} for index in range(3)
+    ]
+    (raw / "events.jsonl").write_text(
+        "\n".join(json.dumps(record) for record in records) + "\n", encoding="utf-8"
+    )
+    load_events(raw)
+    assert (raw / CACHE_NAME).exists()
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("streaming decoded the whole cache")
+
+    monkeypatch.setattr(eventcache, "_read", _fail)
+    monkeypatch.setattr(eventcache, "_read_store", _fail)
+    result = distill_session("s", raw, tmp_path / "artifacts", settings, streaming=True)
+    assert result.artifacts[0].filename == "session-transcript.md"
@@ -0,0 +1,76 @@
+import dataclasses
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from oh2webui_cli.distiller import distill_session
+from oh2webui_cli.eventcache import load_store
+from oh2webui_cli.eventstore import EventStore
+from oh2webui_cli.grouper import Event, group_events, iter_events
+
+
+def _events() -> list[Event]:
+    start = datetime(2025, 1, 1, 12, 0, tzinfo=timezone(timedelta(hours=-5)))
+    return [
+        Event("003", "assistant", "later", start + timedelta(minutes=9), "success", {"cwd": "/w"}),
+        Event("002", "user", "first", start, None, {"source": "events.jsonl", "source_index": 1}),
+        Event("003", "tool", "early", start + timedelta(minutes=2), None, {"cwd": "/w"}),
+        Event("004", "tool", "naive", datetime(2025, 1, 1, 18, 30, 0, 250), "failed", {}),
+    ]
+
+
+def test_event_store_round_trips_events() -> None:
+    events = _events()
+    store = EventStore.from_events(events)
+
+    assert len(store) == 4
+    assert list(store) == events
+    assert store[-1] == events[-1]
+    assert store[0].timestamp.utcoffset() == timedelta(hours=-5)
+
+
+def test_event_store_groups_match_group_events() -> None:
+    events = _events()[:3]
+    expected = group_events(events)
+    groups = EventStore.from_events(events).groups()
+
+    assert [group.step for group in groups] == [group.step for group in expected]
+    for group, reference in zip(groups, expected):
+        assert list(group.events) == reference.events
+        assert (group.started_at, group.completed_at) == (
+            reference.started_at,
+            reference.completed_at,
+        )
+        assert (group.status, group.cwd, group.title) == (
+            reference.status,
+            reference.cwd,
+            reference.title,
+        )
+
+
+def test_compact_distill_matches_default(tmp_path: Path, settings) -> None:
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    records = [
+        {"step": f"{2 + index % 3:03d}", "content": f"event {index}", "ts": 1735732800 + index}
+        for index in range(12)
+    ]
+    (raw / "events.jsonl").write_text(
+        "\n".join(json.dumps(record) for record in records) + "\n", encoding="utf-8"
+    )
+
+    distill_session("s", raw, tmp_path / "default", settings)
+    compact = dataclasses.replace(settings, compact_events=True)
+    distill_session("s", raw, tmp_path / "compact", compact)
+    distill_session("s", raw, tmp_path / "compact-cached", compact)
+
+    def body(name: str) -> str:
+        return (
+            (tmp_path / name / "session-transcript.md")
+            .read_text(encoding="utf-8")
+            .split("\n---\n", 1)[1]
+        )
+
+    assert body("compact") == body("default")
+    assert body("compact-cached") == body("default")
+    assert list(load_store(raw)) == list(iter_events(raw))
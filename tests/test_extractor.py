@@ -0,0 +1,139 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from oh2webui_cli.extractor import ExtractionError, extract_session
+
+
+def _seed_session(root: Path) -> Path:
+    session_dir = root / "session-1"
+    (session_dir / "events").mkdir(parents=True)
+    (session_dir / "events.jsonl").write_text('{"step": "002"}\n', encoding="utf-8")
+    (session_dir / "events" / "0.json").write_text('{"id": 0}', encoding="utf-8")
+    return session_dir
+
+
+def test_extract_session_copies_by_default(tmp_path: Path) -> None:
+    source = _seed_session(tmp_path / "sessions")
+    result = extract_session("session-1", tmp_path / "sessions", tmp_path / "raw")
+
+    assert result.copied is True
+    assert result.files_copied == 2
+    assert result.files_linked == 0
+    copied = tmp_path / "raw" / "events.jsonl"
+    assert copied.read_text(encoding="utf-8") == '{"step": "002"}\n'
+    assert not os.path.samefile(copied, source / "events.jsonl")
+
+
+def test_extract_session_hardlinks_files(tmp_path: Path) -> None:
+    source = _seed_session(tmp_path / "sessions")
+    result = extract_session("session-1", tmp_path / "sessions", tmp_path / "raw", mode="hardlink")
+
+    assert result.mode == "hardlink"
+    assert result.files_linked == 2
+    assert result.files_copied == 0
+    assert os.path.samefile(tmp_path / "raw" / "events" / "0.json", source / "events" / "0.json")
+
+
+def test_extract_session_symlinks_and_overwrites(tmp_path: Path) -> None:
+    source = _seed_session(tmp_path / "sessions")
+    extract_session("session-1", tmp_path / "sessions", tmp_path / "raw")
+    result = extract_session(
+        "session-1", tmp_path / "sessions", tmp_path / "raw", overwrite=True, mode="symlink"
+    )
+
+    linked = tmp_path / "raw" / "events.jsonl"
+    assert result.files_linked == 2
+    assert linked.is_symlink()
+    assert linked.resolve() == (source / "events.jsonl").resolve()
+
+
+def test_extract_session_rejects_unknown_mode(tmp_path: Path) -> None:
+    _seed_session(tmp_path / "sessions")
+    with pytest.raises(ExtractionError):
+        extract_session("session-1", tmp_path / "sessions", tmp_path / "raw", mode="teleport")
+
+
+def test_extract_session_selective_skips_unused_files(tmp_path: Path) -> None:
+    source = _seed_session(tmp_path / "sessions")
+    (source / "screenshots").mkdir()
+    (source / "screenshots" / "step-1.png").write_bytes(b"\x89PNG" + b"\x00" * 96)
+    (source / "metadata.json").write_text('{"title": "demo"}', encoding="utf-8")
+
+    result = extract_session(
+        "session-1",
+        tmp_path / "sessions",
+        tmp_path / "raw",
+        include=["metadata.json"],
+    )
+
+    raw = tmp_path / "raw"
+    assert (raw / "events.jsonl").exists()
+    assert (raw / "events" / "0.json").exists()
+    assert (raw / "metadata.json").exists()
+    assert not (raw / "screenshots").exists()
+    assert result.files_copied == 3
+    assert result.files_skipped == 1
+    assert result.bytes_skipped == 100
+
+
+def test_extract_session_sync_transfers_only_changes(tmp_path: Path) -> None:
+    source = _seed_session(tmp_path / "sessions")
+    (source / "metadata.json").write_text('{"title": "demo"}', encoding="utf-8")
+    extract_session("session-1", tmp_path / "sessions", tmp_path / "raw")
+
+    unchanged = extract_session("session-1", tmp_path / "sessions", tmp_path / "raw", sync=True)
+    assert unchanged.copied is False
+    assert unchanged.files_transferred == 0
+
+    appended = '{"step": "003"}\n'
+    with (source / "events.jsonl").open("a", encoding="utf-8") as handle:
+        handle.write(appended)
+    (source / "events" / "1.json").write_text('{"id": 1}', encoding="utf-8")
+    (source / "metadata.json").write_text('{"title": "renamed"}', encoding="utf-8")
+
+    result = extract_session("session-1", tmp_path / "sessions", tmp_path / "raw", sync=True)
+
+    raw = tmp_path / "raw"
+    assert result.copied is True
+    assert result.files_appended == 1
+    assert result.files_copied == 2
+    assert result.files_transferred == 3
+    assert result.bytes_transferred == len(appended) + len('{"id": 1}') + len(
+        '{"title": "renamed"}'
+    )
+    assert (raw / "events.jsonl").read_text(encoding="utf-8") == '{"step": "002"}\n' + appended
+    assert (raw / "metadata.json").read_text(encoding="utf-8") == '{"title": "renamed"}'
+
+
+def test_extract_session_sync_leaves_linked_files_alone(tmp_path: Path) -> None:
+    source = _seed_session(tmp_path / "sessions")
+    extract_session("session-1", tmp_path / "sessions", tmp_path / "raw", mode="hardlink")
+    with (source / "events.jsonl").open("a", encoding="utf-8") as handle:
+        handle.write('{"step": "003"}\n')
+
+    result = extract_session(
+        "session-1", tmp_path / "sessions", tmp_path / "raw", mode="hardlink", sync=True
+    )
+
+    assert result.files_transferred == 0
+    assert (tmp_path / "raw" / "events.jsonl").read_text(encoding="utf-8").count("\n") == 2
+
+
+def test_extract_session_sync_replaces_rewritten_jsonl(tmp_path: Path) -> None:
+    source = _seed_session(tmp_path / "sessions")
+    extract_session("session-1", tmp_path / "sessions", tmp_path / "raw")
+    (source / "events.jsonl").write_text('{"step": "009"}\n{"step": "010"}\n', encoding="utf-8")
+
+    result = extract_session(
+        "session-1", tmp_path / "sessions", tmp_path / "raw", sync=True, checksum=True
+    )
+
+    assert result.files_appended == 0
+    assert result.files_copied == 1
+    assert (
+        (tmp_path / "raw" / "events.jsonl")
+        .read_text(encoding="utf-8")
+        .startswith('{"step": "009"}')
+    )
@@ -1,8 +1,22 @@
 import json
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
-from oh2webui_cli.grouper import load_event_groups
+import pytest
+
+from oh2webui_cli import grouper
+from oh2webui_cli.grouper import (
+    Event,
+    EventGroup,
+    LazyEvent,
+    group_events,
+    iter_event_groups,
+    iter_events,
+    load_event_groups,
+)
+from oh2webui_cli.jsonbackend import JSONBackend
 
 
 def test_load_event_groups_from_jsonl(tmp_path: Path) -> None:
@@ -101,3 +115,212 @@ def test_status_inferred_from_success_flag(tmp_path: Path) -> None:
     assert len(groups) == 2
     assert groups[0].status == "success"
     assert groups[1].status == "failed"
+
+
+def test_iter_event_groups_streams_consecutive_steps(tmp_path: Path) -> None:
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    base = datetime(2025, 1, 3, 8, 0, tzinfo=timezone.utc)
+    events = [
+        {"step": "001", "role": "user", "content": "Start", "ts": base.isoformat()},
+        {"step": "002", "role": "assistant", "content": "Build", "ts": base.isoformat()},
+        {"step": "002", "role": "assistant", "content": "Done", "ts": base.isoformat()},
+        {"step": "003", "role": "assistant", "content": "Tests", "ts": base.isoformat()},
+    ]
+    with (raw_dir / "events.jsonl").open("w", encoding="utf-8") as handle:
+        for item in events:
+            handle.write(json.dumps(item) + "\n")
+
+    stream = iter_event_groups(raw_dir)
+    first = next(stream)
+    assert first.step == "001"
+    assert [len(group.events) for group in stream] == [2, 1]
+    assert [group.step for group in load_event_groups(raw_dir)] == ["001", "002", "003"]
+
+
+def test_parallel_jsonl_parsing_keeps_line_order(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    lines = []
+    for index in range(200):
+        lines.append(
+            json.dumps(
+                {
+                    "step": f"{2 + index // 10:03d}",
+                    "role": "assistant",
+                    "content": f"event {index}",
+                    "timestamp": f"2024-01-01T00:{index // 60:02d}:{index % 60:02d}Z",
+                }
+            )
+        )
+        if index % 17 == 0:
+            lines.append("   ")
+    (raw / "events.jsonl").write_text("\n".join(lines), encoding="utf-8")
+
+    serial = list(iter_events(raw))
+    monkeypatch.setattr(grouper, "_PARALLEL_MIN_BYTES", 0)
+    parallel = list(iter_events(raw, workers=3))
+
+    assert parallel == serial
+    assert [event.metadata["source_index"] for event in serial][:3] == [1, 3, 4]
+
+
+def test_parallel_jsonl_parsing_bounds_chunks_in_flight(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    lines = [json.dumps({"step": "002", "content": f"event {index}"}) for index in range(400)]
+    (raw / "events.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    submitted: list[object] = []
+
+    class CountingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, /, *args, **kwargs):
+            submitted.append(args)
+            return super().submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(grouper, "ProcessPoolExecutor", CountingExecutor)
+    monkeypatch.setattr(grouper, "_PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(grouper, "_CHUNKS_PER_WORKER", 20)
+    events = iter_events(raw, workers=2)
+
+    assert next(events).content == "event 0"
+    assert len(submitted) <= 2 * 2
+    assert [event.content for event in events][-1] == "event 399"
+    assert len(submitted) == 40
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_directory_loading_keeps_file_order(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, workers: int
+) -> None:
+    raw = tmp_path / "raw"
+    events_dir = raw / "events"
+    events_dir.mkdir(parents=True)
+    for index in range(90):
+        payload = {"step": f"{2 + index // 9:03d}", "content": f"event {index}"}
+        if index % 10 == 0:
+            payload = [payload, {"step": payload["step"], "content": f"extra {index}"}]
+        (events_dir / f"{index:04d}.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    serial = list(iter_events(raw))
+    monkeypatch.setattr(grouper, "_PARALLEL_MIN_FILES", 0)
+    monkeypatch.setattr(grouper, "_FILES_PER_JOB", 7)
+    parallel = list(iter_events(raw, workers=workers))
+
+    assert parallel == serial
+    assert len(parallel) == 99
+    assert parallel[1].metadata["source"] == "0000.json"
+    assert parallel[1].metadata["source_index"] == 2
+
+
+def test_group_events_precomputes_bounds_and_orders_steps() -> None:
+    def event(step: str, minute: int) -> Event:
+        return Event(
+            step=step,
+            role="assistant",
+            content=f"{step}@{minute}",
+            timestamp=datetime(2025, 1, 1, 12, minute, tzinfo=timezone.utc),
+        )
+
+    groups = group_events(
+        [event("003", 5), event("002", 9), event("003", 1), event("002", 3), event("003", 7)]
+    )
+
+    assert [group.step for group in groups] == ["003", "002"]
+    first = groups[0]
+    assert [e.content for e in first.events] == ["003@1", "003@5", "003@7"]
+    assert first.started_at == datetime(2025, 1, 1, 12, 1, tzinfo=timezone.utc)
+    assert first.completed_at == datetime(2025, 1, 1, 12, 7, tzinfo=timezone.utc)
+    assert EventGroup(step="002", events=groups[1].events).completed_at == groups[1].completed_at
+
+
+def test_event_group_derived_properties_are_cached() -> None:
+    start = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    events = [
+        Event("004", "tool", "", start, "failed", {"tags": "b, a", "cwd": "/repo"}),
+        Event("004", "assistant", "  Ran tests\nall green", start, "success", {"tags": ["c"]}),
+    ]
+    group = EventGroup(step="004", events=events)
+
+    assert (group.status, group.cwd, group.title) == ("success", "/repo", "Ran tests")
+    tags = group.tags
+    assert tags == ["a", "b", "c"]
+    tags.append("mutated")
+    events[1].metadata["tags"] = ["z"]
+    events[0].metadata["cwd"] = "/elsewhere"
+    assert group.tags == ["a", "b", "c"]
+    assert group.cwd == "/repo"
+    assert group == EventGroup(step="004", events=events)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_lazy_events_read_large_content_from_sources(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, workers: int
+) -> None:
+    raw = tmp_path / "raw"
+    events_dir = raw / "events"
+    events_dir.mkdir(parents=True)
+    large = "output line\r\n" * 400
+    lines = [
+        json.dumps({"step": "002", "role": "user", "content": "short"}),
+        "",
+        json.dumps({"step": "002", "role": "tool", "message": large, "exit_code": 1}),
+    ]
+    (raw / "events.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    (events_dir / "0001.json").write_text(
+        json.dumps({"events": [{"step": "003", "text": "é" + large}, {"step": "003"}]}),
+        encoding="utf-8",
+    )
+    (events_dir / "0002.json").write_text(
+        json.dumps({"step": "004", "summary": large}), encoding="utf-8"
+    )
+    monkeypatch.setattr(grouper, "_PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(grouper, "_PARALLEL_MIN_FILES", 0)
+
+    eager = list(iter_events(raw))
+    lazy = list(iter_events(raw, workers=workers, lazy=True))
+
+    def fields(events: list[Event]) -> list[tuple]:
+        return [
+            (event.step, event.role, event.content, event.timestamp, event.status, event.metadata)
+            for event in events
+        ]
+
+    assert fields(lazy) == fields(eager)
+    assert [isinstance(event, LazyEvent) for event in lazy] == [
+        False,
+        True,
+        False,
+        False,
+        True,
+    ]
+    assert lazy[1].status == "failed"
+    assert lazy[2].content.startswith("é")
+    lazy[1].content = "edited"
+    assert lazy[1].content == "edited"
+
+
+def test_lazy_mode_decodes_container_files_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    events = [{"step": f"{2 + index:03d}", "content": f"{index} " * 3000} for index in range(5)]
+    (raw / "session.json").write_text(json.dumps({"events": events}), encoding="utf-8")
+
+    decoded: list[int] = []
+    backend = grouper.active_backend()
+
+    def loads(data: bytes | str) -> Any:
+        decoded.append(len(data))
+        return backend.loads(data)
+
+    monkeypatch.setattr(grouper, "active_backend", lambda: JSONBackend("counting", loads))
+    lazy = list(iter_events(raw, lazy=True))
+
+    assert [event.content.split()[0] for event in lazy] == ["0", "1", "2", "3", "4"]
+    assert not any(isinstance(event, LazyEvent) for event in lazy)
+    assert len(decoded) == 1
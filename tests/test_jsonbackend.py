@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from oh2webui_cli import jsonbackend
+from oh2webui_cli.grouper import iter_events
+from oh2webui_cli.jsonbackend import JSONBackendError, available_backends, get_backend
+
+
+@pytest.fixture(autouse=True)
+def _reset_backend(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("OH2WEBUI_JSON_BACKEND", raising=False)
+    jsonbackend.set_backend(None)
+    yield
+    jsonbackend.set_backend(None)
+
+
+@pytest.mark.parametrize("name", available_backends())
+def test_backends_decode_events_identically(tmp_path: Path, name: str) -> None:
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    lines = [
+        {
+            "step": "002",
+            "role": "assistant",
+            "content": "héllo",
+            "timestamp": "2024-01-01T00:00:00Z",
+        },
+        {"step": "002", "role": "tool", "content": "done", "timestamp": "2024-01-01T00:00:01Z"},
+    ]
+    (raw / "events.jsonl").write_text(
+        "\n".join(json.dumps(line) for line in lines) + "\n", encoding="utf-8"
+    )
+
+    jsonbackend.set_backend("json")
+    expected = list(iter_events(raw))
+    assert jsonbackend.set_backend(name).name == name
+    assert list(iter_events(raw)) == expected
+
+
+def test_backend_rejects_invalid_json_with_value_error() -> None:
+    for name in available_backends():
+        with pytest.raises(ValueError):
+            get_backend(name).loads(b"{not json")
+
+
+def test_backend_selection_from_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert jsonbackend.active_backend().name == "json"
+    monkeypatch.setenv("OH2WEBUI_JSON_BACKEND", "auto")
+    jsonbackend.set_backend(None)
+    assert jsonbackend.active_backend().name == available_backends()[0]
+
+    with pytest.raises(JSONBackendError):
+        get_backend("simdjson")
+
+
+@pytest.mark.parametrize("name", available_backends())
+def test_backends_accept_non_finite_numbers(tmp_path: Path, name: str) -> None:
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    line = json.dumps({"step": "002", "content": "priced", "metadata": {"cost": float("nan")}})
+    assert "NaN" in line
+    (raw / "events.jsonl").write_text(line + "\n", encoding="utf-8")
+
+    jsonbackend.set_backend(name)
+    (event,) = iter_events(raw)
+    assert event.content == "priced"
+    assert event.metadata["cost"] != event.metadata["cost"]
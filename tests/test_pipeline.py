@@ -0,0 +1,101 @@
+from pathlib import Path
+
+from oh2webui_cli import pipeline
+from oh2webui_cli.pipeline import run_pipeline
+from oh2webui_cli.uploader import UploadError, UploadResult
+
+from . import seed_session
+
+
+def test_run_pipeline_processes_sessions_end_to_end(tmp_path: Path, settings) -> None:
+    sessions_root = tmp_path / "sessions"
+    seed_session(sessions_root, "alpha")
+    seed_session(sessions_root, "beta")
+    work_root = tmp_path / "work"
+
+    outcomes = run_pipeline(
+        ["alpha", "missing", "beta"],
+        sessions_root=sessions_root,
+        work_root=work_root,
+        settings=settings,
+        variant="3B",
+        cpu_workers=2,
+        net_workers=2,
+    )
+
+    assert [outcome.session_id for outcome in outcomes] == ["alpha", "missing", "beta"]
+    alpha, missing, beta = outcomes
+    assert alpha.ok and alpha.stage == "done"
+    assert alpha.chat_id and alpha.chat_id.startswith("dry-chat-")
+    assert set(alpha.durations) == {"extract", "distill", "upload", "chat"}
+    assert beta.ok
+    assert not missing.ok and missing.stage == "extract"
+
+    log = (work_root / "beta" / "artifacts" / "ingest.log").read_text(encoding="utf-8")
+    assert "collection ready" in log
+    assert "chat created" in log
+
+
+def test_run_pipeline_reports_distill_and_upload_failures(
+    tmp_path: Path, settings, monkeypatch
+) -> None:
+    sessions_root = tmp_path / "sessions"
+    seed_session(sessions_root, "alpha")
+    seed_session(sessions_root, "beta")
+    (sessions_root / "malformed").mkdir()
+    (sessions_root / "malformed" / "events.jsonl").write_text("[1,2]\n", encoding="utf-8")
+    upload_artifacts = pipeline.upload_artifacts
+
+    def upload(*, session_id: str, **kwargs) -> UploadResult:
+        if session_id == "beta":
+            raise UploadError("upload failed with status 500")
+        return upload_artifacts(session_id=session_id, **kwargs)
+
+    monkeypatch.setattr(pipeline, "upload_artifacts", upload)
+    alpha, malformed, beta = run_pipeline(
+        ["alpha", "malformed", "beta"],
+        sessions_root=sessions_root,
+        work_root=tmp_path / "work",
+        settings=settings,
+        cpu_workers=1,
+        net_workers=1,
+    )
+
+    assert alpha.ok and alpha.stage == "done"
+    assert not malformed.ok and malformed.stage == "distill"
+    assert "distill" not in malformed.durations
+    assert not beta.ok and beta.stage == "upload"
+    assert beta.error == "UploadError: upload failed with status 500"
+    assert beta.chat_id is None
+
+
+def test_run_pipeline_fails_sessions_with_unattached_files(
+    tmp_path: Path, settings, monkeypatch
+) -> None:
+    sessions_root = tmp_path / "sessions"
+    seed_session(sessions_root, "alpha")
+
+    def upload(*, session_id: str, artifacts_dir: Path, settings, variant: str) -> UploadResult:
+        return UploadResult(
+            session_id=session_id,
+            collection_id="collection-1",
+            collection_name="oh-alpha",
+            file_ids=["file-1"],
+            variant=variant,
+            dry_run=True,
+            failed_attachments=["file-1"],
+        )
+
+    monkeypatch.setattr(pipeline, "upload_artifacts", upload)
+    (outcome,) = run_pipeline(
+        ["alpha"],
+        sessions_root=sessions_root,
+        work_root=tmp_path / "work",
+        settings=settings,
+        cpu_workers=1,
+        net_workers=1,
+    )
+
+    assert not outcome.ok and outcome.stage == "upload"
+    assert "failed to attach: file-1" in (outcome.error or "")
+    assert outcome.chat_id is None
@@ -1,9 +1,26 @@
 import json
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 
+import httpx
+import pytest
+
+from oh2webui_cli import uploader
 from oh2webui_cli.distiller import distill_session
-from oh2webui_cli.uploader import upload_artifacts
+from oh2webui_cli.endpoints import EndpointCache
+from oh2webui_cli.uploader import (
+    AttachOutcome,
+    OpenWebUIClient,
+    UploadError,
+    upload_artifacts,
+)
+
+
+@pytest.fixture(autouse=True)
+def _forget_server_versions(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(uploader, "_SERVER_VERSIONS", {})
 
 
 def _seed_events(raw_dir: Path) -> None:
@@ -20,6 +37,17 @@ def _seed_events(raw_dir: Path) -> None:
             handle.write(json.dumps(item) + "\n")
 
 
+def _live_client(settings, handler) -> OpenWebUIClient:
+    settings.dry_run = False
+    settings.base_url = "https://webui.test"
+    settings.api_token = "token"
+    client = OpenWebUIClient(settings)
+    client._client = httpx.Client(
+        base_url=settings.base_url, transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
 def test_upload_artifacts_dry_run(tmp_path: Path, settings) -> None:
     raw_dir = tmp_path / "raw"
     raw_dir.mkdir()
@@ -46,3 +74,395 @@ def test_upload_artifacts_dry_run(tmp_path: Path, settings) -> None:
 
     ingest_log = (artifacts_dir / "ingest.log").read_text(encoding="utf-8")
     assert "collection ready" in ingest_log
+
+
+def test_upload_artifacts_overlaps_uploads_and_keeps_log_order(
+    tmp_path: Path, settings, monkeypatch
+) -> None:
+    artifacts_dir = tmp_path / "artifacts"
+    artifacts_dir.mkdir()
+    records = []
+    for index in range(4):
+        name = f"artifact-{index}.md"
+        (artifacts_dir / name).write_text(f"artifact {index}\n", encoding="utf-8")
+        records.append({"filename": name, "step": str(index), "status": None, "hash": name})
+    (artifacts_dir / "run.json").write_text(json.dumps({"artifacts": records}), encoding="utf-8")
+
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+    attached: list[str] = []
+
+    class FakeClient:
+        def __init__(self, actual_settings):
+            self.dry_run = False
+
+        def upload_markdown(self, file_path: Path) -> str:
+            return f"file-{file_path.stem}"
+
+        def poll_file(self, file_id: str) -> str:
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            # Later artifacts finish first to prove the log is still manifest-ordered.
+            time.sleep(0.05 * (4 - int(file_id[-1])))
+            with lock:
+                state["active"] -= 1
+            return "processed"
+
+        def create_collection(self, name: str, description: str) -> str:
+            return "collection-1"
+
+        def attach_files(self, collection_id: str, file_ids: list[str], *, concurrency: int):
+            attached.extend(file_ids)
+            return [AttachOutcome(file_id, True) for file_id in file_ids]
+
+        def close(self) -> None:
+            pass
+
+    monkeypatch.setattr("oh2webui_cli.uploader.OpenWebUIClient", FakeClient)
+
+    result = upload_artifacts(
+        session_id="session-many",
+        artifacts_dir=artifacts_dir,
+        settings=settings,
+        variant="3B",
+        workers=4,
+    )
+
+    expected = [f"file-artifact-{index}" for index in range(4)]
+    assert result.file_ids == expected
+    assert attached == expected
+    assert state["peak"] > 1
+
+    log_lines = (artifacts_dir / "ingest.log").read_text(encoding="utf-8").splitlines()
+    processed = [
+        line.split("id=")[1].split()[0] for line in log_lines if "upload processed" in line
+    ]
+    assert processed == expected
+
+
+def test_collection_is_created_while_uploads_are_pending(
+    tmp_path: Path, settings, monkeypatch
+) -> None:
+    artifacts_dir = tmp_path / "artifacts"
+    artifacts_dir.mkdir()
+    records = []
+    for index in range(3):
+        name = f"artifact-{index}.md"
+        (artifacts_dir / name).write_text(f"artifact {index}\n", encoding="utf-8")
+        records.append({"filename": name, "step": str(index), "status": None, "hash": name})
+    (artifacts_dir / "run.json").write_text(json.dumps({"artifacts": records}), encoding="utf-8")
+    created = threading.Event()
+    overlapped: list[bool] = []
+
+    class FakeClient:
+        def __init__(self, actual_settings):
+            self.dry_run = False
+
+        def upload_markdown(self, file_path: Path) -> str:
+            return f"file-{file_path.stem}"
+
+        def poll_file(self, file_id: str) -> str:
+            if file_id.endswith("2"):
+                overlapped.append(created.wait(timeout=2))
+            return "processed"
+
+        def create_collection(self, name: str, description: str) -> str:
+            created.set()
+            return "collection-1"
+
+        def attach_files(self, collection_id: str, file_ids: list[str], *, concurrency: int):
+            return [AttachOutcome(file_id, True) for file_id in file_ids]
+
+        def close(self) -> None:
+            pass
+
+    monkeypatch.setattr("oh2webui_cli.uploader.OpenWebUIClient", FakeClient)
+
+    result = upload_artifacts(
+        session_id="session-overlap",
+        artifacts_dir=artifacts_dir,
+        settings=settings,
+        variant="3B",
+        workers=1,
+    )
+
+    assert result.collection_id == "collection-1"
+    assert overlapped == [True]
+
+
+@pytest.mark.parametrize("failing", [0, 2])
+def test_failed_upload_leaves_no_collection(
+    tmp_path: Path, settings, monkeypatch, failing: int
+) -> None:
+    artifacts_dir = tmp_path / "artifacts"
+    artifacts_dir.mkdir()
+    records = []
+    for index in range(3):
+        name = f"artifact-{index}.md"
+        (artifacts_dir / name).write_text(f"artifact {index}\n", encoding="utf-8")
+        records.append({"filename": name, "step": str(index), "status": None, "hash": name})
+    (artifacts_dir / "run.json").write_text(json.dumps({"artifacts": records}), encoding="utf-8")
+    collections: list[str] = []
+
+    class FakeClient:
+        def __init__(self, actual_settings):
+            self.dry_run = False
+
+        def upload_markdown(self, file_path: Path) -> str:
+            return f"file-{file_path.stem}"
+
+        def poll_file(self, file_id: str) -> str:
+            return "failed" if file_id.endswith(str(failing)) else "processed"
+
+        def create_collection(self, name: str, description: str) -> str:
+            collections.append("collection-1")
+            return "collection-1"
+
+        def delete_collection(self, collection_id: str) -> None:
+            collections.remove(collection_id)
+
+        def close(self) -> None:
+            pass
+
+    monkeypatch.setattr("oh2webui_cli.uploader.OpenWebUIClient", FakeClient)
+
+    with pytest.raises(UploadError, match=f"artifact-{failing}.md failed processing"):
+        upload_artifacts(
+            session_id="session-bad",
+            artifacts_dir=artifacts_dir,
+            settings=settings,
+            variant="3B",
+            workers=1,
+        )
+
+    assert collections == []
+
+
+def test_poll_file_backs_off_and_caches_status_endpoint(settings, monkeypatch) -> None:
+    requests: list[str] = []
+    checks = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/api/version":
+            return httpx.Response(200, json={"version": "0.6.30"})
+        if request.url.path.endswith("/process/status"):
+            return httpx.Response(404)
+        checks["count"] += 1
+        done = checks["count"] % 3 == 0
+        return httpx.Response(200, json={"data": {"status": "processed" if done else "pending"}})
+
+    sleeps: list[float] = []
+    monkeypatch.setattr("oh2webui_cli.uploader.time.sleep", sleeps.append)
+    client = _live_client(settings, handler)
+
+    assert client.poll_file("file-1", initial_delay=0.2, max_delay=5.0) == "processed"
+    assert client.poll_file("file-2") == "processed"
+
+    assert requests.count("/api/v1/files/file-1/process/status") == 1
+    assert "/api/v1/files/file-2/process/status" not in requests
+    assert len(sleeps) == 4
+    assert 0.1 <= sleeps[0] <= 0.2
+    assert 0.2 <= sleeps[1] <= 0.4
+
+
+def test_endpoint_cache_persists_working_routes(settings, tmp_path: Path) -> None:
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/api/version":
+            return httpx.Response(200, json={"version": "0.6.30"})
+        if request.url.path == "/api/v1/knowledge/create":
+            return httpx.Response(405)
+        return httpx.Response(200, json={"id": "knowledge-1"})
+
+    first = _live_client(settings, handler)
+    assert first.create_collection("oh-session", "demo") == "knowledge-1"
+    first.close()
+    cache = json.loads((tmp_path / "endpoints.json").read_text(encoding="utf-8"))
+    routes = cache["entries"]["https://webui.test|0.6.30"]["routes"]
+    assert routes == {"knowledge_create": "/api/v1/knowledge"}
+
+    requests.clear()
+    second = _live_client(settings, handler)
+    assert second.create_collection("oh-session", "demo") == "knowledge-1"
+    assert requests == ["/api/v1/knowledge"]
+
+    requests.clear()
+    settings.endpoint_cache = None
+    uncached = _live_client(settings, handler)
+    assert uncached.create_collection("oh-session", "demo") == "knowledge-1"
+    assert "/api/version" not in requests
+
+
+def test_routes_learned_without_a_server_version_are_not_persisted(
+    settings, tmp_path: Path
+) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/version":
+            return httpx.Response(503)
+        if request.url.path == "/api/v1/knowledge/create":
+            return httpx.Response(405)
+        return httpx.Response(200, json={"id": "knowledge-1"})
+
+    client = _live_client(settings, handler)
+    assert client.create_collection("oh-session", "demo") == "knowledge-1"
+    assert not (tmp_path / "endpoints.json").exists()
+    assert uploader._SERVER_VERSIONS == {}
+
+
+def test_endpoint_cache_saves_safely_from_many_clients(tmp_path: Path) -> None:
+    path = tmp_path / "endpoints.json"
+    caches = [
+        EndpointCache(base_url=f"https://webui-{index}.test", version="1", path=path)
+        for index in range(8)
+    ]
+    threads = [
+        threading.Thread(target=cache.remember, args=("upload", f"/route-{index}"))
+        for index, cache in enumerate(caches)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    entries = json.loads(path.read_text(encoding="utf-8"))["entries"]
+    assert len(entries) == 8
+    assert [item.name for item in tmp_path.iterdir()] == ["endpoints.json"]
+
+
+def test_attach_files_falls_back_to_bounded_single_attaches(settings) -> None:
+    attached: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/files/batch/add"):
+            return httpx.Response(404)
+        if path.endswith("/file/add"):
+            file_id = json.loads(request.content)["file_id"]
+            if file_id == "file-bad":
+                return httpx.Response(500)
+            attached.append(file_id)
+            return httpx.Response(200, json={})
+        return httpx.Response(200, json={})
+
+    client = _live_client(settings, handler)
+    outcomes = client.attach_files("knowledge-1", ["file-a", "file-bad", "file-b"], concurrency=2)
+
+    assert [(outcome.file_id, outcome.attached) for outcome in outcomes] == [
+        ("file-a", True),
+        ("file-bad", False),
+        ("file-b", True),
+    ]
+    assert sorted(attached) == ["file-a", "file-b"]
+
+    retry = client.attach_files("knowledge-1", ["file-bad"])
+    assert retry[0].error == "status 500"
+    assert sorted(attached) == ["file-a", "file-b"]
+
+
+def test_failed_batch_attach_is_retried_per_file(settings) -> None:
+    posts: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/files/batch/add"):
+            posts.append("batch")
+            return httpx.Response(500)
+        if path.endswith("/file/add"):
+            posts.append(json.loads(request.content)["file_id"])
+            return httpx.Response(200, json={})
+        return httpx.Response(200, json={})
+
+    client = _live_client(settings, handler)
+    outcomes = client.attach_files("knowledge-1", ["file-a", "file-b"])
+    assert not any(outcome.attached for outcome in outcomes)
+
+    retried = client.attach_files("knowledge-1", ["file-a", "file-b"], batch=False)
+    assert all(outcome.attached for outcome in retried)
+    assert posts[0] == "batch" and sorted(posts[1:]) == ["file-a", "file-b"]
+
+
+def test_complete_chat_consumes_stream_and_writes_reply_once(settings) -> None:
+    calls: list[tuple[str, str]] = []
+    chat_posts: list[dict] = []
+    chunks = [
+        {"choices": [{"delta": {"content": "Status: "}}]},
+        {"choices": [{"delta": {"content": "green"}, "finish_reason": "stop"}]},
+    ]
+    stream_body = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks)
+    stream_body += "data: [DONE]\n\n"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if request.url.path == "/api/chat/completions":
+            payload = json.loads(request.content)
+            assert payload["stream"] is True
+            assert payload["chat_id"] == "chat-1" and payload["id"]
+            if payload.get("session_id"):
+                # Open WebUI hands socket-backed chats to a background task.
+                return httpx.Response(200, json={"status": True, "task_id": "task-1"})
+            return httpx.Response(
+                200, headers={"content-type": "text/event-stream"}, text=stream_body
+            )
+        if request.method == "GET" and request.url.path == "/api/v1/chats/chat-1":
+            return httpx.Response(
+                200,
+                json={"chat": {"messages": [{"id": "user-1", "role": "user", "content": "hi"}]}},
+            )
+        if request.method == "POST" and request.url.path == "/api/v1/chats/chat-1":
+            chat_posts.append(json.loads(request.content)["chat"])
+        return httpx.Response(200, json={})
+
+    client = _live_client(settings, handler)
+    client.complete_chat(
+        chat_id="chat-1", user_msg_id="user-1", session_id="session-1", user_message="hi"
+    )
+
+    assert ("GET", "/api/v1/chats/chat-1") in calls
+    assert calls.count(("GET", "/api/v1/chats/chat-1")) == 1
+    assert not any(path.startswith("/api/tasks") for _, path in calls)
+    final = chat_posts[-1]
+    assistant = [message for message in final["messages"] if message["role"] == "assistant"]
+    assert assistant[0]["content"] == "Status: green\n"
+    assert assistant[0]["done"] is True
+
+
+def test_create_chat_3a_uses_minimum_round_trips(settings) -> None:
+    calls: list[tuple[str, str]] = []
+    created: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if request.url.path == "/api/v1/chats/new":
+            created.append(json.loads(request.content)["chat"])
+            return httpx.Response(200, json={"id": "chat-9"})
+        if request.url.path == "/api/chat/completions":
+            body = 'data: {"choices": [{"delta": {"content": "All good"}}]}\n\ndata: [DONE]\n\n'
+            return httpx.Response(200, headers={"content-type": "text/event-stream"}, text=body)
+        return httpx.Response(200, json={})
+
+    client = _live_client(settings, handler)
+    chat_id = client.create_chat(
+        collection_id="knowledge-1",
+        collection_name="oh-session",
+        title="oh/homedoc",
+        variant="3A",
+        prefill="Session digest",
+        session_id="session-1",
+    )
+
+    assert chat_id == "chat-9"
+    assert [call for call in calls if call[1] != "/api/version"] == [
+        ("POST", "/api/v1/chats/new"),
+        ("POST", "/api/chat/completions"),
+        ("POST", "/api/v1/chats/chat-9"),
+        ("POST", "/api/chat/completed"),
+    ]
+    chat = created[0]
+    assert chat["knowledge_ids"] == ["knowledge-1"]
+    assert chat["messages"][0]["files"][0]["name"] == "oh-session"
+    assert chat["messages"][1]["role"] == "assistant"
+    assert chat["currentId"] == chat["messages"][1]["id"]